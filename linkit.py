@@ -13,11 +13,877 @@ import uuid
 import re
 from reportlab.lib.colors import black, white
 from reportlab.lib.units import inch
+import asyncio
+import ssl
+import threading
+import time
+from urllib.parse import urlsplit, urljoin, quote, unquote
+import socket
+import html
+from collections import OrderedDict, deque
+import hashlib
+import bisect
+import itertools
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from tkinter import filedialog
+
+try:
+    import cv2  # Offline QR decoder used by batch scan reconciliation
+except ImportError:
+    cv2 = None
 
 # Set the appearance mode and color theme
 ctk.set_appearance_mode("System")  # "System", "Dark", "Light"
 ctk.set_default_color_theme("blue")  # "blue", "green", "dark-blue"
 
+class TagIndex:
+    """
+    Maps every tag to the set of record ids carrying it.
+    Tags are free-form; a "facet:value" tag such as "location:a1" belongs to the facet
+    before the colon, and a tag without one is a facet of its own. Faceted filters OR the
+    values within a facet and AND the facets together, using set unions and intersections.
+    """
+
+    OTHER_FACET = "other"  # Heading for tags without a facet in facet listings
+
+    def __init__(self, records=()):
+        self.ids_by_tag = {}
+        self.tags_by_id = {}
+        for record in records:
+            self.add(record)
+
+    @staticmethod
+    def parse_tags(text):
+        """Normalizes comma-separated tag text into a list of unique lower-case tags."""
+        tags = []
+        for tag in text.split(","):
+            tag = ":".join(part.strip() for part in tag.split(":", 1)).lower()
+            if tag and tag not in tags:
+                tags.append(tag)
+        return tags
+
+    @staticmethod
+    def format_tags(tags):
+        return ", ".join(tags)
+
+    @staticmethod
+    def facet_of(tag):
+        facet, separator, _ = tag.partition(":")
+        return facet if separator else None
+
+    def add(self, record):
+        tags = set(record.get("tags", []))
+        self.tags_by_id[record["id"]] = tags
+        for tag in tags:
+            self.ids_by_tag.setdefault(tag, set()).add(record["id"])
+
+    def remove(self, record_id):
+        for tag in self.tags_by_id.pop(record_id, ()):
+            ids = self.ids_by_tag[tag]
+            ids.discard(record_id)
+            if not ids:
+                del self.ids_by_tag[tag]
+
+    def update(self, record):
+        if set(record.get("tags", [])) != self.tags_by_id.get(record["id"]):
+            self.remove(record["id"])
+            self.add(record)
+
+    def match(self, tags, by_facet=True):
+        """
+        Returns the ids matching the given tags. By facet, a record needs one of the listed
+        values in every listed facet, e.g. (location:a1 OR location:a2) AND owner:sam.
+        Otherwise a record matches if it carries any of the tags.
+        """
+        if not tags:
+            return set()
+        if not by_facet:
+            return set().union(*(self.ids_by_tag.get(tag, set()) for tag in tags))
+        groups = {}
+        for tag in tags:
+            # A tag without a facet is required on its own
+            groups.setdefault(self.facet_of(tag) or tag, []).append(tag)
+        facet_sets = [set().union(*(self.ids_by_tag.get(tag, set()) for tag in group)) for group in groups.values()]
+        # Intersect starting from the smallest set
+        facet_sets.sort(key=len)
+        return set.intersection(*facet_sets)
+
+    @classmethod
+    def group_by_facet(cls, counts):
+        """Turns {tag: count} into {facet: {value: count}}; tags without a facet go under "other"."""
+        grouped = {}
+        for tag, count in counts.items():
+            facet = cls.facet_of(tag)
+            if facet is None:
+                grouped.setdefault(cls.OTHER_FACET, {})[tag] = count
+            else:
+                grouped.setdefault(facet, {})[tag.partition(":")[2]] = count
+        return grouped
+
+    @classmethod
+    def format_facets(cls, counts, values_per_facet=6):
+        lines = []
+        for facet, values in sorted(cls.group_by_facet(counts).items()):
+            top = sorted(values.items(), key=lambda value_count: (-value_count[1], value_count[0]))
+            shown = ", ".join(f"{value} ({count})" for value, count in top[:values_per_facet])
+            if len(top) > values_per_facet:
+                shown += f", +{len(top) - values_per_facet} more"
+            lines.append(f"{facet}: {shown}")
+        return "\n".join(lines)
+
+    def facet_counts(self, candidate_ids=None):
+        """Counts how many candidate records carry each tag; all records when no candidates are given."""
+        if candidate_ids is None:
+            counts = {tag: len(ids) for tag, ids in self.ids_by_tag.items()}
+        else:
+            counts = {tag: len(ids & candidate_ids) for tag, ids in self.ids_by_tag.items()}
+        return {tag: count for tag, count in counts.items() if count}
+
+class RecordIndex:
+    """
+    Keeps records addressable by id and ordered for every sort mode.
+    Each order index is a sorted list of (key, id) pairs updated with bisect on every
+    mutation, so a page of results in any order is a slice rather than a full sort.
+    """
+
+    DATE_ADDED = "Date Added"
+
+    def __init__(self, records, sort_keys):
+        self.records = records
+        # Insertion order is the "date added" order, tracked with a running sequence number
+        self.sort_keys = dict(sort_keys)
+        self.sort_keys[self.DATE_ADDED] = lambda record: self._sequence[record["id"]]
+        self.rebuild()
+
+    @property
+    def sort_modes(self):
+        return [self.DATE_ADDED] + [mode for mode in self.sort_keys if mode != self.DATE_ADDED]
+
+    def rebuild(self):
+        self.by_id = {record["id"]: record for record in self.records}
+        self.tag_index = TagIndex(self.records)
+        self._sequence = {record["id"]: i for i, record in enumerate(self.records)}
+        self._next_sequence = len(self.records)
+        self._keys = {}
+        self._orders = {}
+        for mode, key_func in self.sort_keys.items():
+            keys = {record["id"]: key_func(record) for record in self.records}
+            self._keys[mode] = keys
+            self._orders[mode] = sorted((key, record_id) for record_id, key in keys.items())
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, record_id):
+        return self.by_id.get(record_id)
+
+    def add(self, record):
+        record_id = record["id"]
+        self.records.append(record)
+        self.by_id[record_id] = record
+        self._sequence[record_id] = self._next_sequence
+        self._next_sequence += 1
+        self.tag_index.add(record)
+        for mode, key_func in self.sort_keys.items():
+            key = key_func(record)
+            self._keys[mode][record_id] = key
+            bisect.insort(self._orders[mode], (key, record_id))
+
+    def update(self, record):
+        """Re-positions a record after its fields were changed in place."""
+        record_id = record["id"]
+        self.tag_index.update(record)
+        for mode, key_func in self.sort_keys.items():
+            key = key_func(record)
+            old_key = self._keys[mode][record_id]
+            if key == old_key:
+                continue
+            order = self._orders[mode]
+            del order[bisect.bisect_left(order, (old_key, record_id))]
+            bisect.insort(order, (key, record_id))
+            self._keys[mode][record_id] = key
+
+    def remove(self, record_ids):
+        record_ids = set(record_ids) & self.by_id.keys()
+        if not record_ids:
+            return
+        self.records[:] = [record for record in self.records if record["id"] not in record_ids]
+        for record_id in record_ids:
+            del self.by_id[record_id]
+            del self._sequence[record_id]
+            self.tag_index.remove(record_id)
+        for mode in self.sort_keys:
+            keys = self._keys[mode]
+            order = self._orders[mode]
+            if len(record_ids) == 1:
+                record_id = next(iter(record_ids))
+                del order[bisect.bisect_left(order, (keys[record_id], record_id))]
+            else:
+                # Filtering keeps the list sorted, so bulk deletes stay linear
+                order[:] = [entry for entry in order if entry[1] not in record_ids]
+            for record_id in record_ids:
+                del keys[record_id]
+
+    def iter_ids(self, mode, descending=False):
+        order = self._orders[mode]
+        entries = reversed(order) if descending else order
+        return (record_id for _, record_id in entries)
+
+    def matching_ids(self, ids=None, predicate=None):
+        """Returns the set of ids within ids (all records when None) that satisfy the predicate."""
+        if predicate is None:
+            return set(self.by_id) if ids is None else set(ids)
+        records = self.records if ids is None else (self.by_id[record_id] for record_id in ids)
+        return {record["id"] for record in records if predicate(record)}
+
+    def page(self, mode, offset, limit, descending=False, predicate=None, ids=None):
+        """
+        Returns (records, total) for one page of the records in the given sort order.
+        ids restricts the result to a candidate set such as a tag filter. Without a predicate
+        the page is a slice; with one, matches are counted in a single pass.
+        """
+        order = self._orders[mode]
+        if predicate is None and ids is None:
+            total = len(order)
+            if descending:
+                start, stop = max(total - offset - limit, 0), max(total - offset, 0)
+                entries = reversed(order[start:stop])
+            else:
+                entries = order[offset:offset + limit]
+            return [self.by_id[record_id] for _, record_id in entries], total
+
+        if ids is not None and len(ids) * 16 < len(order):
+            # Sorting a small candidate set is cheaper than walking the whole order
+            keys = self._keys[mode]
+            candidates = sorted(ids, key=lambda record_id: (keys[record_id], record_id), reverse=descending)
+        else:
+            candidates = self.iter_ids(mode, descending)
+            if ids is not None:
+                candidates = (record_id for record_id in candidates if record_id in ids)
+
+        if predicate is None:
+            return [self.by_id[record_id] for record_id in itertools.islice(candidates, offset, offset + limit)], len(ids)
+
+        page_records = []
+        total = 0
+        for record_id in candidates:
+            record = self.by_id[record_id]
+            if predicate(record):
+                if offset <= total < offset + limit:
+                    page_records.append(record)
+                total += 1
+        return page_records, total
+
+class LinkHealthChecker:
+    """
+    Checks saved links concurrently with asyncio.
+    Connections are pooled and kept alive per host, and the status, ETag and
+    Last-Modified of every URL are cached so later checks are conditional.
+    """
+
+    CACHE_FILE = "link_health.json"
+    MAX_DRAIN_BYTES = 1024 * 1024  # Larger GET bodies close the connection instead of being read
+    MAX_REDIRECTS = 5
+    REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+    SUPPORTED_SCHEMES = ("http", "https")
+
+    def __init__(self, cache_file=None, per_host_limit=4, max_connections=100, timeout=10):
+        self.cache_file = cache_file or self.CACHE_FILE
+        self.per_host_limit = per_host_limit
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.cache = self.load_cache()
+
+    def load_cache(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, "r") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                return {}
+        return {}
+
+    def save_cache(self):
+        try:
+            with open(self.cache_file, "w") as f:
+                json.dump(self.cache, f, indent=4)
+        except Exception as e:
+            print(f"Failed to save link health cache: {e}")
+
+    def get_result(self, url):
+        return self.cache.get(url)
+
+    @classmethod
+    def can_check(cls, url):
+        return urlsplit(url).scheme in cls.SUPPORTED_SCHEMES
+
+    def check_all(self, urls):
+        """Blocking entry point; returns a dict mapping each URL to its result."""
+        results = asyncio.run(self.check_urls(urls))
+        self.save_cache()
+        return results
+
+    async def check_urls(self, urls):
+        self._pools = {}
+        self._host_limits = {}
+        self._global_limit = asyncio.Semaphore(self.max_connections)
+        self._ssl_context = ssl.create_default_context()
+        unique_urls = list(dict.fromkeys(urls))
+        try:
+            results = await asyncio.gather(*(self._check_one(url) for url in unique_urls))
+        finally:
+            for pool in self._pools.values():
+                for _, writer in pool:
+                    writer.close()
+            self._pools = {}
+        return dict(zip(unique_urls, results))
+
+    async def _check_one(self, url):
+        cached = self.cache.get(url) or {}
+        try:
+            headers = {}
+            if cached.get("status") and cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("status") and cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+            status, response_headers = await self._fetch_status(url, headers)
+            if status == 304:
+                result = dict(cached, checked=time.time(), error=None)
+            else:
+                # Follow redirects so a moved link is judged by where it ends up
+                final_url = url
+                for _ in range(self.MAX_REDIRECTS):
+                    if status not in self.REDIRECT_STATUSES or "location" not in response_headers:
+                        break
+                    final_url = urljoin(final_url, response_headers["location"])
+                    status, response_headers = await self._fetch_status(final_url, {})
+                else:
+                    if status in self.REDIRECT_STATUSES:
+                        raise ValueError("Too many redirects")
+                redirected = final_url != url
+                result = {
+                    "status": status,
+                    # Validators only apply to the URL they came from
+                    "etag": None if redirected else response_headers.get("etag"),
+                    "last_modified": None if redirected else response_headers.get("last-modified"),
+                    "redirected_to": final_url if redirected else None,
+                    "checked": time.time(),
+                    "error": None,
+                }
+        except Exception as e:
+            result = {"status": None, "etag": None, "last_modified": None, "redirected_to": None, "checked": time.time(), "error": str(e) or type(e).__name__}
+        self.cache[url] = result
+        return result
+
+    async def _fetch_status(self, url, headers):
+        parts = urlsplit(url)
+        if parts.scheme not in self.SUPPORTED_SCHEMES or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        # Saved links may hold non-ASCII hosts and paths, but the request must be ASCII
+        host = parts.hostname.encode("idna").decode("ascii")
+        host_key = (parts.scheme, host, port)
+        host_header = f"[{host}]" if ":" in host else host
+        if parts.port:
+            host_header += f":{parts.port}"
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        target = quote(target, safe="/?&=%:@!$'()*+,;~")
+
+        status, response_headers = await self._request(host_key, host_header, "HEAD", target, headers)
+        if status in (405, 501):
+            # Some servers refuse HEAD; retry with GET
+            status, response_headers = await self._request(host_key, host_header, "GET", target, headers)
+        return status, response_headers
+
+    async def _request(self, host_key, host_header, method, target, headers):
+        if host_key not in self._host_limits:
+            self._host_limits[host_key] = asyncio.Semaphore(self.per_host_limit)
+            self._pools[host_key] = []
+        async with self._host_limits[host_key], self._global_limit:
+            pool = self._pools[host_key]
+            # A pooled connection may have been closed by the server, so retry once on a fresh one
+            while True:
+                reused = bool(pool)
+                reader, writer = pool.pop() if reused else await self._open_connection(host_key)
+                try:
+                    status, response_headers, keep_alive = await asyncio.wait_for(
+                        self._exchange(reader, writer, host_header, method, target, headers), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep_alive:
+                    pool.append((reader, writer))
+                else:
+                    writer.close()
+                return status, response_headers
+
+    async def _open_connection(self, host_key):
+        scheme, host, port = host_key
+        ssl_context = self._ssl_context if scheme == "https" else None
+        return await asyncio.wait_for(asyncio.open_connection(host, port, ssl=ssl_context), self.timeout)
+
+    async def _exchange(self, reader, writer, host_header, method, target, headers):
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host_header}", "User-Agent: Linkit-LinkChecker", "Accept: */*", "Connection: keep-alive"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        head = await reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        for line in header_lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                response_headers[name.strip().lower()] = value.strip()
+
+        keep_alive = response_headers.get("connection", "").lower() != "close" and status_line.startswith("HTTP/1.1")
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return status, response_headers, keep_alive
+
+        # Drain the body of a GET so the connection can be reused
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            drained = 0
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                drained += size
+                if drained > self.MAX_DRAIN_BYTES:
+                    return status, response_headers, False
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif "content-length" in response_headers:
+            length = int(response_headers["content-length"])
+            if length > self.MAX_DRAIN_BYTES:
+                return status, response_headers, False
+            await reader.readexactly(length)
+        else:
+            keep_alive = False
+        return status, response_headers, keep_alive
+
+class ExportCache:
+    """
+    Content-addressed store for exported files.
+    Files are named after a hash of the exported records and layout parameters, so
+    repeating an export returns the existing file. Files not used within the age
+    limit, and the least recently used files beyond the size limit, are evicted.
+    Kinds listed in keep_kinds are never evicted for age, only to stay under the size limit.
+    """
+
+    def __init__(self, directory, max_bytes=100 * 1024 * 1024, max_age_days=30, keep_kinds=()):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.keep_prefixes = tuple(f"{kind}_" for kind in keep_kinds)
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+    @staticmethod
+    def make_key(kind, records, **params):
+        payload = json.dumps({"kind": kind, "records": records, "params": params}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, kind, key, extension):
+        return os.path.join(self.directory, f"{kind}_{key[:16]}{extension}")
+
+    def get_or_create(self, kind, key, extension, build):
+        """
+        Returns (path, created). build(path) is only called when no file exists for the key;
+        it writes to a temporary name that is renamed into place once complete.
+        """
+        path = self.path_for(kind, key, extension)
+        if os.path.exists(path):
+            os.utime(path)  # Mark as recently used for eviction
+            return path, False
+        temp_path = os.path.join(self.directory, f".{uuid.uuid4().hex}{extension}")
+        try:
+            build(temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict(keep=path)
+        return path, True
+
+    def evict(self, keep=None):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.startswith("."):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        cutoff = time.time() - self.max_age_days * 24 * 60 * 60
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if path == keep:
+                continue
+            if total <= self.max_bytes:
+                if mtime >= cutoff:
+                    break
+                if os.path.basename(path).startswith(self.keep_prefixes):
+                    continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                print(f"Failed to evict export {path}: {e}")
+
+_qr_detector = None
+
+def decode_qr_image(path):
+    """Decodes every QR payload in one image file. Runs in a worker process, so it must stay module-level."""
+    global _qr_detector
+    try:
+        if _qr_detector is None:
+            _qr_detector = cv2.QRCodeDetector()
+        image = cv2.imread(path)
+        if image is None:
+            return path, [], "Unreadable image"
+        found, payloads, _, _ = _qr_detector.detectAndDecodeMulti(image)
+        payloads = [payload for payload in payloads if payload] if found else []
+        if not payloads:
+            payload, _, _ = _qr_detector.detectAndDecode(image)
+            payloads = [payload] if payload else []
+        return path, payloads, None
+    except Exception as e:
+        return path, [], str(e)
+
+class ScanReconciler:
+    """
+    Reconciles photos of inventory QR codes against the item index.
+    Images are decoded in a process pool and each payload (a bare item id, or a scan
+    server item URL) is resolved with an O(1) id lookup.
+    """
+
+    IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
+    def __init__(self, get_item, max_workers=None, decoder=decode_qr_image):
+        self.get_item = get_item
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.decoder = decoder
+
+    @classmethod
+    def find_images(cls, folder):
+        for root, _, filenames in os.walk(folder):
+            for filename in sorted(filenames):
+                if filename.lower().endswith(cls.IMAGE_EXTENSIONS):
+                    yield os.path.join(root, filename)
+
+    @staticmethod
+    def payload_to_id(payload):
+        payload = payload.strip()
+        if payload.startswith(("http://", "https://")):
+            path = urlsplit(payload).path
+            if "/items/" in path:
+                return unquote(path.rsplit("/items/", 1)[1])
+        return payload
+
+    def decode_images(self, image_paths):
+        """
+        Yields (path, payloads, error) per image, in order. Only a small window of images is in
+        flight, so if a worker crashes on a corrupt file just that window is retried one image
+        per process; the image that crashes again is reported as an error and the run goes on.
+        """
+        # The app is multi-threaded (Tk, scan server, link checks), so forking could copy held locks
+        # into the workers; spawn fresh interpreters as macOS and Windows already do
+        context = multiprocessing.get_context("spawn")
+        window = self.max_workers * 2
+        paths = iter(image_paths)
+        pending = deque()
+        pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        try:
+            while True:
+                for path in itertools.islice(paths, window - len(pending)):
+                    try:
+                        future = pool.submit(self.decoder, path)
+                    except BrokenProcessPool as e:
+                        # A worker already crashed; this image is retried with the other suspects below
+                        future = Future()
+                        future.set_exception(e)
+                    pending.append((path, future))
+                if not pending:
+                    break
+                path, future = pending.popleft()
+                if not isinstance(future.exception(), BrokenProcessPool):
+                    yield self.decode_result(path, future)
+                    continue
+                suspects = [(path, future)] + list(pending)
+                pending.clear()
+                pool.shutdown(wait=False)
+                for path, future in suspects:
+                    if isinstance(future.exception(), BrokenProcessPool):
+                        yield self.decode_isolated(path, context)
+                    else:
+                        yield self.decode_result(path, future)
+                pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    @staticmethod
+    def decode_result(path, future):
+        # A decoder that raises only fails its own image
+        error = future.exception()
+        if error is not None:
+            return path, [], str(error) or type(error).__name__
+        return future.result()
+
+    def decode_isolated(self, path, context):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            future = pool.submit(self.decoder, path)
+            if isinstance(future.exception(), BrokenProcessPool):
+                return path, [], "Decoder crashed on this image"
+            return self.decode_result(path, future)
+
+    def reconcile(self, image_paths, expected_ids):
+        """
+        Returns a report dict: "found" (ids seen), "missing" (expected ids not seen),
+        "unknown" (payload -> images for payloads matching no item), "errors" and "images".
+        """
+        if cv2 is None and self.decoder is decode_qr_image:
+            raise RuntimeError("Batch reconciliation needs OpenCV. Install it with: pip install opencv-python-headless")
+        found = set()
+        unknown = {}
+        errors = []
+        image_count = 0
+        for path, payloads, error in self.decode_images(image_paths):
+            image_count += 1
+            if error:
+                errors.append((path, error))
+            for payload in payloads:
+                item_id = self.payload_to_id(payload)
+                if self.get_item(item_id) is not None:
+                    found.add(item_id)
+                else:
+                    unknown.setdefault(payload, []).append(path)
+        return {
+            "found": found,
+            "missing": set(expected_ids) - found,
+            "unknown": unknown,
+            "errors": errors,
+            "images": image_count,
+        }
+
+class InventoryServer:
+    """
+    Optional embedded HTTP server so scanned inventory QR codes open on a phone.
+    Serves item detail pages by id and the exported collection PDFs. Item pages
+    are rendered on demand and kept in an LRU cache that is invalidated on edit.
+    """
+
+    DEFAULT_PORT = 8765
+    PAGE_CACHE_SIZE = 512
+    IDLE_TIMEOUT = 15  # Seconds a keep-alive connection may sit idle between requests
+    STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+    def __init__(self, get_item, pdf_directory, host="0.0.0.0", port=DEFAULT_PORT):
+        self.get_item = get_item
+        self.pdf_directory = pdf_directory
+        self.host = host
+        self.port = port
+        self.page_cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        # Bumped by invalidate() so a page rendered from a stale item is never cached
+        self.cache_generation = 0
+        self.item_generations = {}
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def base_url(self):
+        host = self.host
+        if host in ("0.0.0.0", ""):
+            host = self.get_lan_address()
+        return f"http://{host}:{self.port}"
+
+    def item_url(self, item_id):
+        return f"{self.base_url}/items/{quote(item_id)}"
+
+    def pdf_url(self, pdf_filename):
+        return f"{self.base_url}/exports/{quote(os.path.basename(pdf_filename))}"
+
+    @staticmethod
+    def get_lan_address():
+        # Connecting a UDP socket sends nothing but selects the outgoing interface
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.connect(("10.255.255.255", 1))
+                return s.getsockname()[0]
+        except OSError:
+            return "127.0.0.1"
+
+    def start(self):
+        """Starts the server on a background thread; raises OSError if the port cannot be bound."""
+        if self.is_running:
+            return
+        started = threading.Event()
+        errors = []
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_server(self._handle_connection, self.host, self.port, backlog=1024))
+                self.port = self._server.sockets[0].getsockname()[1]
+            except OSError as e:
+                errors.append(e)
+                started.set()
+                self._loop.close()
+                return
+            started.set()
+            try:
+                self._loop.run_forever()
+            finally:
+                self._server.close()
+                pending = asyncio.all_tasks(self._loop)
+                for task in pending:
+                    task.cancel()
+                self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                self._loop.run_until_complete(self._server.wait_closed())
+                self._loop.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            self._thread.join()
+            self._thread = None
+            raise errors[0]
+
+    def stop(self):
+        if not self.is_running:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        self.invalidate()
+
+    def invalidate(self, item_id=None):
+        """Drops the cached page of one item, or of every item when no id is given."""
+        with self.cache_lock:
+            if item_id is None:
+                self.page_cache.clear()
+                self.cache_generation += 1
+            else:
+                self.page_cache.pop(item_id, None)
+                self.item_generations[item_id] = self.item_generations.get(item_id, 0) + 1
+
+    def get_item_page(self, item_id):
+        with self.cache_lock:
+            page = self.page_cache.get(item_id)
+            if page is not None:
+                self.page_cache.move_to_end(item_id)
+                return page
+            generation = (self.cache_generation, self.item_generations.get(item_id, 0))
+        item = self.get_item(item_id)
+        if item is None:
+            return None
+        page = self.render_item_page(item)
+        with self.cache_lock:
+            # An edit invalidated the item while it was rendering; serve this page but don't keep it
+            if generation == (self.cache_generation, self.item_generations.get(item_id, 0)):
+                self.page_cache[item_id] = page
+                if len(self.page_cache) > self.PAGE_CACHE_SIZE:
+                    self.page_cache.popitem(last=False)
+        return page
+
+    def render_item_page(self, item):
+        name = html.escape(item["name"])
+        description = html.escape(item["description"])
+        item_id = html.escape(item["id"])
+        tags = f"<p><b>Tags:</b> {html.escape(TagIndex.format_tags(item['tags']))}</p>" if item.get("tags") else ""
+        return (
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+            "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">"
+            f"<title>{name}</title></head><body style=\"font-family: sans-serif; margin: 2em;\">"
+            f"<h1>{name}</h1><p><b>Description:</b> {description}</p>"
+            f"<p><b>Unique ID:</b> <code>{item_id}</code></p>{tags}</body></html>"
+        ).encode("utf-8")
+
+    def read_pdf(self, filename):
+        filename = unquote(filename)
+        # Only serve PDFs that live directly inside the export directory
+        if os.path.basename(filename) != filename or not filename.lower().endswith(".pdf"):
+            return None
+        path = os.path.join(self.pdf_directory, filename)
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except (OSError, ValueError):  # ValueError: embedded null byte
+            return None
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.IDLE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                keep_alive = not any(line.lower().replace(" ", "") == "connection:close" for line in header_lines)
+                parts = request_line.split()
+                if len(parts) != 3:
+                    await self._send(writer, 400, b"Bad request", "text/plain", False)
+                    break
+                method, path, _ = parts
+                if method not in ("GET", "HEAD"):
+                    await self._send(writer, 405, b"Method not allowed", "text/plain", False)
+                    break
+                try:
+                    status, body, content_type = await self._route(path.split("?", 1)[0])
+                except Exception as e:
+                    # One bad request must not take down the connection handler
+                    print(f"Scan server failed to handle {path}: {e}")
+                    status, body, content_type = 500, b"Internal server error", "text/plain"
+                await self._send(writer, status, body, content_type, keep_alive, head_only=method == "HEAD")
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, path):
+        if path.startswith("/items/"):
+            page = self.get_item_page(unquote(path[len("/items/"):]))
+            if page is not None:
+                return 200, page, "text/html; charset=utf-8"
+            return 404, b"Item not found", "text/plain"
+        if path.startswith("/exports/"):
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(None, self.read_pdf, path[len("/exports/"):])
+            if data is not None:
+                return 200, data, "application/pdf"
+        return 404, b"Not found", "text/plain"
+
+    async def _send(self, writer, status, body, content_type, keep_alive, head_only=False):
+        headers = [
+            f"HTTP/1.1 {status} {self.STATUS_TEXT[status]}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive" if keep_alive else "Connection: close",
+        ]
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+        if not head_only:
+            writer.write(body)
+        await writer.drain()
+
 class LinkitApp(ctk.CTk):
     """
     A cross-platform desktop application for managing links and inventory.
@@ -154,6 +1020,8 @@ class UrlManagerFrame(ctk.CTkFrame):
     """Frame for the original URL management features."""
     
     LINKS_FILE = "links.json"
+    PDF_DIRECTORY = "exported_link_pdfs"
+    PAGE_SIZE = 50
 
     def __init__(self, master, font_size):
         super().__init__(master)
@@ -162,7 +1030,9 @@ class UrlManagerFrame(ctk.CTkFrame):
         self.grid_rowconfigure(2, weight=1)
         
         self.checkbox_vars = {}
-        self.editing_index = None
+        self.selected_ids = set()
+        self.editing_id = None
+        self.current_page = 0
 
         # --- UI Components ---
         self.top_frame = ctk.CTkFrame(self, corner_radius=10)
@@ -186,8 +1056,14 @@ class UrlManagerFrame(ctk.CTkFrame):
         self.url_entry = ctk.CTkEntry(self.add_frame, placeholder_text="Enter the full URL (e.g., https://www.google.com)", font=ctk.CTkFont(size=self.font_size))
         self.url_entry.grid(row=3, column=0, padx=10, pady=5, sticky="ew")
 
+        self.link_tags_label = ctk.CTkLabel(self.add_frame, text="Tags:", font=ctk.CTkFont(size=self.font_size, weight="bold"))
+        self.link_tags_label.grid(row=4, column=0, padx=10, pady=(10, 5), sticky="w")
+
+        self.link_tags_entry = ctk.CTkEntry(self.add_frame, placeholder_text="Comma-separated, e.g. category:docs, owner:sam", font=ctk.CTkFont(size=self.font_size))
+        self.link_tags_entry.grid(row=5, column=0, padx=10, pady=5, sticky="ew")
+
         self.add_button = ctk.CTkButton(self.add_frame, text="Add Link", command=self.add_or_update_link, font=ctk.CTkFont(size=self.font_size))
-        self.add_button.grid(row=4, column=0, padx=10, pady=(10, 10))
+        self.add_button.grid(row=6, column=0, padx=10, pady=(10, 10))
 
         self.action_frame = ctk.CTkFrame(self.top_frame, corner_radius=10)
         self.action_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
@@ -205,16 +1081,58 @@ class UrlManagerFrame(ctk.CTkFrame):
         self.export_button = ctk.CTkButton(self.action_frame, text="Export to PDF", command=self.export_to_pdf, font=ctk.CTkFont(size=self.font_size))
         self.export_button.grid(row=3, column=0, padx=20, pady=5, sticky="ew")
 
-        self.search_entry = ctk.CTkEntry(self, placeholder_text="Search links...", font=ctk.CTkFont(size=self.font_size))
-        self.search_entry.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="ew")
+        self.check_links_button = ctk.CTkButton(self.action_frame, text="Check Links", command=self.check_links, font=ctk.CTkFont(size=self.font_size))
+        self.check_links_button.grid(row=4, column=0, padx=20, pady=5, sticky="ew")
+
+        self.view_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.view_frame.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="ew")
+        self.view_frame.grid_columnconfigure(0, weight=1)
+
+        self.search_entry = ctk.CTkEntry(self.view_frame, placeholder_text="Search links...", font=ctk.CTkFont(size=self.font_size))
+        self.search_entry.grid(row=0, column=0, sticky="ew")
         self.search_entry.bind("<KeyRelease>", self.filter_links)
 
+        self.sort_menu = ctk.CTkOptionMenu(self.view_frame, values=[RecordIndex.DATE_ADDED], command=self.change_sort, font=ctk.CTkFont(size=self.font_size))
+        self.sort_menu.grid(row=0, column=1, padx=(10, 0))
+
+        self.order_menu = ctk.CTkOptionMenu(self.view_frame, values=["Ascending", "Descending"], command=self.change_sort, font=ctk.CTkFont(size=self.font_size))
+        self.order_menu.grid(row=0, column=2, padx=(10, 0))
+
+        self.tag_filter_entry = ctk.CTkEntry(self.view_frame, placeholder_text="Filter by tags, e.g. category:docs, owner:sam", font=ctk.CTkFont(size=self.font_size))
+        self.tag_filter_entry.grid(row=1, column=0, pady=(10, 0), sticky="ew")
+        self.tag_filter_entry.bind("<KeyRelease>", self.filter_links)
+
+        self.tag_mode_menu = ctk.CTkOptionMenu(self.view_frame, values=["Match Facets", "Any Tag"], command=self.change_sort, font=ctk.CTkFont(size=self.font_size))
+        self.tag_mode_menu.grid(row=1, column=1, columnspan=2, padx=(10, 0), pady=(10, 0), sticky="ew")
+
+        self.facet_label = ctk.CTkLabel(self.view_frame, text="", font=ctk.CTkFont(size=self.font_size - 2), text_color="#A9A9A9", wraplength=800, justify="left")
+        self.facet_label.grid(row=2, column=0, columnspan=3, pady=(5, 0), sticky="w")
+
         self.link_list_frame = ctk.CTkScrollableFrame(self, corner_radius=10)
-        self.link_list_frame.grid(row=2, column=0, padx=20, pady=(0, 20), sticky="nsew")
+        self.link_list_frame.grid(row=2, column=0, padx=20, pady=(0, 10), sticky="nsew")
         self.link_list_frame.grid_columnconfigure(1, weight=1)
 
+        self.pager_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.pager_frame.grid(row=3, column=0, padx=20, pady=(0, 20), sticky="ew")
+        self.pager_frame.grid_columnconfigure(1, weight=1)
+
+        self.prev_page_button = ctk.CTkButton(self.pager_frame, text="< Prev", width=80, command=self.previous_page, font=ctk.CTkFont(size=self.font_size))
+        self.prev_page_button.grid(row=0, column=0)
+
+        self.page_label = ctk.CTkLabel(self.pager_frame, text="", font=ctk.CTkFont(size=self.font_size))
+        self.page_label.grid(row=0, column=1)
+
+        self.next_page_button = ctk.CTkButton(self.pager_frame, text="Next >", width=80, command=self.next_page, font=ctk.CTkFont(size=self.font_size))
+        self.next_page_button.grid(row=0, column=2)
+
         # --- Data Handling ---
+        self.health_checker = LinkHealthChecker()
+        self.export_cache = ExportCache(self.PDF_DIRECTORY)
+        self.export_cache.evict()
+        self.health_check_thread = None
         self.links = self.load_links()
+        self.link_index = RecordIndex(self.links, {"Name": lambda link: link["name"].lower(), "URL": lambda link: link["url"].lower()})
+        self.sort_menu.configure(values=self.link_index.sort_modes)
         self.display_links()
         
     def is_valid_url(self, url):
@@ -231,9 +1149,13 @@ class UrlManagerFrame(ctk.CTkFrame):
         if os.path.exists(self.LINKS_FILE):
             try:
                 with open(self.LINKS_FILE, "r") as f:
-                    return json.load(f)
+                    links = json.load(f)
             except (json.JSONDecodeError, FileNotFoundError):
                 return []
+            # Links saved by older versions have no id
+            for link in links:
+                link.setdefault("id", str(uuid.uuid4()))
+            return links
         return []
 
     def save_links(self):
@@ -246,22 +1168,28 @@ class UrlManagerFrame(ctk.CTkFrame):
     def add_or_update_link(self):
         link_name = self.link_entry.get().strip()
         url = self.url_entry.get().strip()
+        tags = TagIndex.parse_tags(self.link_tags_entry.get())
         if not self.is_valid_url(url):
             tkinter.messagebox.showwarning("Warning", "The URL format is invalid. Please make sure it starts with http:// or https://")
             return
             
         if link_name and url:
-            if self.editing_index is not None:
-                self.links[self.editing_index]["name"] = link_name
-                self.links[self.editing_index]["url"] = url
-                self.editing_index = None
+            if self.editing_id is not None:
+                link = self.link_index.get(self.editing_id)
+                if link:
+                    link["name"] = link_name
+                    link["url"] = url
+                    link["tags"] = tags
+                    self.link_index.update(link)
+                self.editing_id = None
                 self.add_button.configure(text="Add Link")
             else:
-                self.links.append({"name": link_name, "url": url})
+                self.link_index.add({"id": str(uuid.uuid4()), "name": link_name, "url": url, "tags": tags})
             self.save_links()
             self.display_links()
             self.link_entry.delete(0, "end")
             self.url_entry.delete(0, "end")
+            self.link_tags_entry.delete(0, "end")
         else:
             tkinter.messagebox.showwarning("Warning", "Please fill in both the link name and the URL.")
 
@@ -271,24 +1199,78 @@ class UrlManagerFrame(ctk.CTkFrame):
         self.link_entry.configure(font=ctk.CTkFont(size=self.font_size))
         self.url_label.configure(font=ctk.CTkFont(size=self.font_size, weight="bold"))
         self.url_entry.configure(font=ctk.CTkFont(size=self.font_size))
+        self.link_tags_label.configure(font=ctk.CTkFont(size=self.font_size, weight="bold"))
+        self.link_tags_entry.configure(font=ctk.CTkFont(size=self.font_size))
         self.add_button.configure(font=ctk.CTkFont(size=self.font_size))
         self.select_all_button.configure(font=ctk.CTkFont(size=self.font_size))
         self.deselect_all_button.configure(font=ctk.CTkFont(size=self.font_size))
         self.delete_selected_button.configure(font=ctk.CTkFont(size=self.font_size))
         self.export_button.configure(font=ctk.CTkFont(size=self.font_size))
+        self.check_links_button.configure(font=ctk.CTkFont(size=self.font_size))
         self.search_entry.configure(font=ctk.CTkFont(size=self.font_size))
+        self.sort_menu.configure(font=ctk.CTkFont(size=self.font_size))
+        self.order_menu.configure(font=ctk.CTkFont(size=self.font_size))
+        self.prev_page_button.configure(font=ctk.CTkFont(size=self.font_size))
+        self.page_label.configure(font=ctk.CTkFont(size=self.font_size))
+        self.next_page_button.configure(font=ctk.CTkFont(size=self.font_size))
+        self.tag_filter_entry.configure(font=ctk.CTkFont(size=self.font_size))
+        self.tag_mode_menu.configure(font=ctk.CTkFont(size=self.font_size))
+        self.facet_label.configure(font=ctk.CTkFont(size=self.font_size - 2))
         self.display_links(self.search_entry.get().strip().lower())
 
     def filter_links(self, event=None):
+        self.current_page = 0
         self.display_links(self.search_entry.get().strip().lower())
 
-    def set_edit_mode(self, index):
-        self.editing_index = index
-        link = self.links[index]
+    def change_sort(self, _=None):
+        self.current_page = 0
+        self.display_links(self.search_entry.get().strip().lower())
+
+    def previous_page(self):
+        if self.current_page > 0:
+            self.current_page -= 1
+            self.display_links(self.search_entry.get().strip().lower())
+
+    def next_page(self):
+        self.current_page += 1
+        self.display_links(self.search_entry.get().strip().lower())
+
+    def get_search_predicate(self, search_query):
+        if not search_query:
+            return None
+        return lambda link: search_query in link["name"].lower() or search_query in link["url"].lower()
+
+    def get_tag_filter_ids(self):
+        # None means no tag filter is active
+        tags = TagIndex.parse_tags(self.tag_filter_entry.get())
+        if not tags:
+            return None
+        return self.link_index.tag_index.match(tags, self.tag_mode_menu.get() == "Match Facets")
+
+    def toggle_selection(self, link_id, var):
+        if var.get() == 1:
+            self.selected_ids.add(link_id)
+        else:
+            self.selected_ids.discard(link_id)
+
+    def get_selected_links(self):
+        # Selected links in the current sort order
+        descending = self.order_menu.get() == "Descending"
+        selected_ids = self.selected_ids & self.link_index.by_id.keys()
+        selected_links, _ = self.link_index.page(self.sort_menu.get(), 0, len(selected_ids), descending, ids=selected_ids)
+        return selected_links
+
+    def set_edit_mode(self, link_id):
+        link = self.link_index.get(link_id)
+        if link is None:
+            return
+        self.editing_id = link_id
         self.link_entry.delete(0, "end")
         self.url_entry.delete(0, "end")
+        self.link_tags_entry.delete(0, "end")
         self.link_entry.insert(0, link["name"])
         self.url_entry.insert(0, link["url"])
+        self.link_tags_entry.insert(0, TagIndex.format_tags(link.get("tags", [])))
         self.add_button.configure(text="Update Link")
 
     def open_link(self, url):
@@ -297,29 +1279,35 @@ class UrlManagerFrame(ctk.CTkFrame):
         except Exception as e:
             tkinter.messagebox.showerror("Error", f"Failed to open URL: {e}")
 
-    def delete_link(self, index):
-        if 0 <= index < len(self.links):
-            if tkinter.messagebox.askyesno("Confirm Delete", f"Delete '{self.links[index]['name']}'?"):
-                del self.links[index]
+    def delete_link(self, link_id):
+        link = self.link_index.get(link_id)
+        if link is not None:
+            if tkinter.messagebox.askyesno("Confirm Delete", f"Delete '{link['name']}'?"):
+                self.link_index.remove([link_id])
+                self.selected_ids.discard(link_id)
                 self.save_links()
                 self.display_links()
 
     def delete_selected_links(self):
-        selected_indices = [i for i in range(len(self.links)) if self.checkbox_vars[i].get() == 1]
-        if not selected_indices:
+        selected_ids = self.selected_ids & self.link_index.by_id.keys()
+        if not selected_ids:
             tkinter.messagebox.showwarning("Warning", "Please select at least one link to delete.")
             return
-        if tkinter.messagebox.askyesno("Confirm Bulk Delete", f"Delete {len(selected_indices)} selected link(s)?"):
-            for index in sorted(selected_indices, reverse=True):
-                del self.links[index]
+        if tkinter.messagebox.askyesno("Confirm Bulk Delete", f"Delete {len(selected_ids)} selected link(s)?"):
+            self.link_index.remove(selected_ids)
+            self.selected_ids -= selected_ids
             self.save_links()
             self.display_links()
 
     def select_all_links(self):
+        # Selects every link matching the search and tag filter, not just the ones on the current page
+        predicate = self.get_search_predicate(self.search_entry.get().strip().lower())
+        self.selected_ids.update(self.link_index.matching_ids(self.get_tag_filter_ids(), predicate))
         for var in self.checkbox_vars.values():
             var.set(1)
 
     def deselect_all_links(self):
+        self.selected_ids.clear()
         for var in self.checkbox_vars.values():
             var.set(0)
 
@@ -340,119 +1328,189 @@ class UrlManagerFrame(ctk.CTkFrame):
         except Exception as e:
             tkinter.messagebox.showerror("Error", f"Failed to generate QR code: {e}")
 
+    def check_links(self):
+        if self.health_check_thread is not None and self.health_check_thread.is_alive():
+            return
+        # Check the selected links, or every link when nothing is selected; FTP links can't be checked
+        links = self.get_selected_links() or self.links
+        urls = [link["url"] for link in links if self.health_checker.can_check(link["url"])]
+        if not urls:
+            tkinter.messagebox.showwarning("Warning", "There are no HTTP or HTTPS links to check.")
+            return
+        self.check_links_button.configure(text="Checking...", state="disabled")
+        self.health_check_thread = threading.Thread(target=self.health_checker.check_all, args=(urls,), daemon=True)
+        self.health_check_thread.start()
+        self.after(200, self.poll_link_check)
+
+    def poll_link_check(self):
+        # Tkinter widgets must only be touched from the main thread, so poll for completion
+        if self.health_check_thread.is_alive():
+            self.after(200, self.poll_link_check)
+            return
+        self.check_links_button.configure(text="Check Links", state="normal")
+        self.display_links(self.search_entry.get().strip().lower())
+
+    def get_health_badge(self, url):
+        if not self.health_checker.can_check(url):
+            return "Not checked", "#9E9E9E"
+        result = self.health_checker.get_result(url)
+        if result is None:
+            return None, None
+        status = result.get("status")
+        if status is None:
+            return "Unreachable", "#FF9800"
+        if status >= 400:
+            return f"Dead {status}", "#F44336"
+        if 300 <= status < 400:
+            return f"Redirect {status}", "#FF9800"
+        if result.get("redirected_to"):
+            return f"Moved {status}", "#2196F3"
+        return f"OK {status}", "#4CAF50"
+
     def export_to_pdf(self):
-        selected_links = [self.links[i] for i in range(len(self.links)) if self.checkbox_vars[i].get() == 1]
+        selected_links = self.get_selected_links()
         if not selected_links:
             tkinter.messagebox.showwarning("Warning", "Please select at least one link to export.")
             return
 
-        filename = "exported_links.pdf"
-        c = pdf_canvas.Canvas(filename, pagesize=letter)
         margin = 50
-        y_pos = letter[1] - margin
         qr_size = 120
-        # Horizontal positions for the 3 columns
-        col1_x = margin
-        col2_x = margin + qr_size + 20
-        col3_x = col2_x + qr_size + 20
-        
-        c.setFont("Helvetica-Bold", 18)
-        c.drawString(margin, y_pos, "QR Codes")
-        y_pos -= 30
-        
-        for i, link in enumerate(selected_links):
-            # Determine the column for the current link
-            col_index = i % 3
-            current_x = margin + col_index * (qr_size + 20)
-            
-            # Move to a new row if starting a new set of 3
-            if col_index == 0 and i > 0:
-                y_pos -= (qr_size + 40)
-            
-            # Check for new page
-            if y_pos < margin + (qr_size + 40):
-                c.showPage()
-                y_pos = letter[1] - margin
-                c.setFont("Helvetica-Bold", 18)
-                c.drawString(margin, y_pos, "QR Codes (cont.)")
-                y_pos -= 30
-                current_x = margin
+        records = [{"name": link["name"], "url": link["url"]} for link in selected_links]
+        key = self.export_cache.make_key("links", records, margin=margin, qr_size=qr_size, columns=3)
+
+        def build(filename):
+            c = pdf_canvas.Canvas(filename, pagesize=letter)
+            y_pos = letter[1] - margin
+
+            c.setFont("Helvetica-Bold", 18)
+            c.drawString(margin, y_pos, "QR Codes")
+            y_pos -= 30
+
+            for i, link in enumerate(records):
+                # Determine the column for the current link
+                col_index = i % 3
+                current_x = margin + col_index * (qr_size + 20)
+
+                # Move to a new row if starting a new set of 3
+                if col_index == 0 and i > 0:
+                    y_pos -= (qr_size + 40)
+
+                # Check for new page
+                if y_pos < margin + (qr_size + 40):
+                    c.showPage()
+                    y_pos = letter[1] - margin
+                    c.setFont("Helvetica-Bold", 18)
+                    c.drawString(margin, y_pos, "QR Codes (cont.)")
+                    y_pos -= 30
+                    current_x = margin
+
+                try:
+                    # Generate QR code image
+                    qr = qrcode.QRCode(version=1, box_size=5, border=4)
+                    qr.add_data(link['url'])
+                    qr.make(fit=True)
+                    img = qr.make_image(fill_color="black", back_color="white")
+                    img_buffer = io.BytesIO()
+                    img.save(img_buffer, "PNG")
+
+                    # Draw QR code and make it clickable
+                    qr_y = y_pos - qr_size
+                    c.drawImage(ImageReader(img_buffer), current_x, qr_y, width=qr_size, height=qr_size)
+                    c.linkURL(link['url'], (current_x, qr_y, current_x + qr_size, qr_y + qr_size))
+
+                    # Draw link name (truncated if too long) and make it clickable
+                    c.setFont("Helvetica-Bold", 12)
+                    name_to_display = link['name']
+                    max_width = qr_size
+                    if c.stringWidth(name_to_display) > max_width:
+                        while c.stringWidth(name_to_display + "...") > max_width:
+                            name_to_display = name_to_display[:-1]
+                        name_to_display += "..."
+                    c.drawString(current_x, qr_y - 15, name_to_display)
+                    c.linkURL(link['url'], (current_x, qr_y - 15, current_x + c.stringWidth(name_to_display), qr_y - 15 + 12))
+
+                    # Draw URL (truncated if too long) and make it clickable
+                    c.setFont("Helvetica", 8)
+                    url_to_display = link['url']
+                    if c.stringWidth(url_to_display) > max_width:
+                        while c.stringWidth(url_to_display + "...") > max_width:
+                            url_to_display = url_to_display[:-1]
+                        url_to_display += "..."
+                    c.drawString(current_x, qr_y - 25, url_to_display)
+                    c.linkURL(link['url'], (current_x, qr_y - 25, current_x + c.stringWidth(url_to_display), qr_y - 25 + 8))
+
+                except Exception as e:
+                    # Abort the build so a PDF with missing codes is never cached
+                    raise RuntimeError(f"Failed to generate QR for {link['name']}: {e}") from e
+
+            c.save()
 
-            try:
-                # Generate QR code image
-                qr = qrcode.QRCode(version=1, box_size=5, border=4)
-                qr.add_data(link['url'])
-                qr.make(fit=True)
-                img = qr.make_image(fill_color="black", back_color="white")
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, "PNG")
-
-                # Draw QR code and make it clickable
-                qr_y = y_pos - qr_size
-                c.drawImage(ImageReader(img_buffer), current_x, qr_y, width=qr_size, height=qr_size)
-                c.linkURL(link['url'], (current_x, qr_y, current_x + qr_size, qr_y + qr_size))
-
-                # Draw link name (truncated if too long) and make it clickable
-                c.setFont("Helvetica-Bold", 12)
-                name_to_display = link['name']
-                max_width = qr_size
-                if c.stringWidth(name_to_display) > max_width:
-                    while c.stringWidth(name_to_display + "...") > max_width:
-                        name_to_display = name_to_display[:-1]
-                    name_to_display += "..."
-                c.drawString(current_x, qr_y - 15, name_to_display)
-                c.linkURL(link['url'], (current_x, qr_y - 15, current_x + c.stringWidth(name_to_display), qr_y - 15 + 12))
-
-                # Draw URL (truncated if too long) and make it clickable
-                c.setFont("Helvetica", 8)
-                url_to_display = link['url']
-                if c.stringWidth(url_to_display) > max_width:
-                    while c.stringWidth(url_to_display + "...") > max_width:
-                        url_to_display = url_to_display[:-1]
-                    url_to_display += "..."
-                c.drawString(current_x, qr_y - 25, url_to_display)
-                c.linkURL(link['url'], (current_x, qr_y - 25, current_x + c.stringWidth(url_to_display), qr_y - 25 + 8))
-
-            except Exception as e:
-                tkinter.messagebox.showerror("Error", f"Failed to generate QR for {link['name']}: {e}")
-                
-        c.save()
+        try:
+            filename, _ = self.export_cache.get_or_create("links", key, ".pdf", build)
+        except Exception as e:
+            tkinter.messagebox.showerror("Error", f"Failed to export PDF: {e}")
+            return
         tkinter.messagebox.showinfo("Export Complete", f"PDF exported successfully:\n{os.path.abspath(filename)}")
 
     def display_links(self, search_query=""):
         for widget in self.link_list_frame.winfo_children():
             widget.destroy()
         self.checkbox_vars = {}
-        filtered_links = [(i, l) for i, l in enumerate(self.links) if search_query in l["name"].lower() or search_query in l["url"].lower()]
-        if not filtered_links:
+        sort_mode = self.sort_menu.get()
+        descending = self.order_menu.get() == "Descending"
+        predicate = self.get_search_predicate(search_query)
+        tag_ids = self.get_tag_filter_ids()
+        page_links, total = self.link_index.page(sort_mode, self.current_page * self.PAGE_SIZE, self.PAGE_SIZE, descending, predicate, tag_ids)
+        page_count = max(-(-total // self.PAGE_SIZE), 1)
+        if self.current_page >= page_count:
+            # The page no longer exists after a delete or a narrower search
+            self.current_page = page_count - 1
+            page_links, total = self.link_index.page(sort_mode, self.current_page * self.PAGE_SIZE, self.PAGE_SIZE, descending, predicate, tag_ids)
+        self.page_label.configure(text=f"Page {self.current_page + 1} of {page_count} ({total} links)")
+        candidate_ids = None if predicate is None and tag_ids is None else self.link_index.matching_ids(tag_ids, predicate)
+        facets = TagIndex.format_facets(self.link_index.tag_index.facet_counts(candidate_ids))
+        self.facet_label.configure(text=facets)
+        self.prev_page_button.configure(state="normal" if self.current_page > 0 else "disabled")
+        self.next_page_button.configure(state="normal" if self.current_page < page_count - 1 else "disabled")
+
+        if not page_links:
             ctk.CTkLabel(self.link_list_frame, text="No links found.", font=ctk.CTkFont(size=self.font_size)).grid(row=0, column=0, pady=20)
-        for i, (idx, link) in enumerate(filtered_links):
+        for i, link in enumerate(page_links):
             card = ctk.CTkFrame(self.link_list_frame, corner_radius=8)
             card.grid(row=i, column=0, padx=10, pady=5, sticky="ew")
             card.grid_columnconfigure(1, weight=1)
             card.grid_columnconfigure(2, weight=0)
             
-            self.checkbox_vars[idx] = ctk.IntVar(value=0)
-            ctk.CTkCheckBox(card, text="", variable=self.checkbox_vars[idx]).grid(row=0, column=0, rowspan=2, padx=(10, 0), pady=10, sticky="w")
+            var = ctk.IntVar(value=1 if link["id"] in self.selected_ids else 0)
+            self.checkbox_vars[link["id"]] = var
+            ctk.CTkCheckBox(card, text="", variable=var, command=lambda i=link["id"], v=var: self.toggle_selection(i, v)).grid(row=0, column=0, rowspan=2, padx=(10, 0), pady=10, sticky="w")
             
             ctk.CTkLabel(card, text=link["name"], font=ctk.CTkFont(size=self.font_size, weight="bold")).grid(row=0, column=1, padx=(5, 5), pady=5, sticky="w")
             
             url_label = ctk.CTkLabel(card, text=link["url"], font=ctk.CTkFont(size=self.font_size - 2), text_color="#A9A9A9", wraplength=400, justify="left")
             url_label.grid(row=1, column=1, padx=(5, 5), pady=5, sticky="w")
+
+            if link.get("tags"):
+                ctk.CTkLabel(card, text=f"Tags: {TagIndex.format_tags(link['tags'])}", font=ctk.CTkFont(size=self.font_size - 2), text_color="#A9A9A9").grid(row=2, column=1, padx=(5, 5), pady=(0, 5), sticky="w")
+
+            badge_text, badge_color = self.get_health_badge(link["url"])
+            if badge_text:
+                ctk.CTkLabel(card, text=badge_text, fg_color=badge_color, text_color="white", corner_radius=6, font=ctk.CTkFont(size=self.font_size-2, weight="bold")).grid(row=0, column=2, rowspan=2, padx=5, pady=5)
             
             act = ctk.CTkFrame(card, corner_radius=0, fg_color="transparent")
-            act.grid(row=0, column=2, rowspan=2, padx=(5, 10), pady=5, sticky="e")
+            act.grid(row=0, column=3, rowspan=2, padx=(5, 10), pady=5, sticky="e")
             act.grid_columnconfigure((0, 1, 2), weight=1)
             
             ctk.CTkButton(act, text="View QR", command=lambda l=link: self.show_qr_code(l["url"], l["name"]), width=80, font=ctk.CTkFont(size=self.font_size-2)).grid(row=0, column=0, padx=5, pady=5)
-            ctk.CTkButton(act, text="Edit", command=lambda i=idx: self.set_edit_mode(i), width=80, font=ctk.CTkFont(size=self.font_size-2)).grid(row=0, column=1, padx=5, pady=5)
-            ctk.CTkButton(act, text="Delete", command=lambda i=idx: self.delete_link(i), width=80, fg_color="#F44336", hover_color="#D32F2F", font=ctk.CTkFont(size=self.font_size-2)).grid(row=0, column=2, padx=5, pady=5)
+            ctk.CTkButton(act, text="Edit", command=lambda i=link["id"]: self.set_edit_mode(i), width=80, font=ctk.CTkFont(size=self.font_size-2)).grid(row=0, column=1, padx=5, pady=5)
+            ctk.CTkButton(act, text="Delete", command=lambda i=link["id"]: self.delete_link(i), width=80, fg_color="#F44336", hover_color="#D32F2F", font=ctk.CTkFont(size=self.font_size-2)).grid(row=0, column=2, padx=5, pady=5)
 
 class InventoryManagerFrame(ctk.CTkFrame):
     """Frame for the new inventory management features."""
     
     INVENTORY_FILE = "inventory.json"
     PDF_DIRECTORY = "exported_inventory_pdfs"
+    PAGE_SIZE = 50
 
     def __init__(self, master, font_size):
         super().__init__(master)
@@ -460,12 +1518,20 @@ class InventoryManagerFrame(ctk.CTkFrame):
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(2, weight=1)
         
-        if not os.path.exists(self.PDF_DIRECTORY):
-            os.makedirs(self.PDF_DIRECTORY)
+        # Printed collection QR labels point at these PDFs through the scan server, so they don't expire
+        self.export_cache = ExportCache(self.PDF_DIRECTORY, keep_kinds=("inventory_export",))
+        self.export_cache.evict()
 
         self.inventory_items = self.load_inventory()
+        self.item_index = RecordIndex(self.inventory_items, {"Name": lambda item: item["name"].lower(), "Description": lambda item: item["description"].lower()})
         self.editing_id = None
         self.checkbox_vars = {}
+        self.selected_ids = set()
+        self.current_page = 0
+        self.server = InventoryServer(self.item_index.get, self.PDF_DIRECTORY)
+        self.reconciler = ScanReconciler(self.item_index.get)
+        self.reconcile_thread = None
+        self.reconcile_result = None
 
         # --- UI Components ---
         self.top_frame = ctk.CTkFrame(self, corner_radius=10)
@@ -487,8 +1553,13 @@ class InventoryManagerFrame(ctk.CTkFrame):
         self.item_desc_entry = ctk.CTkEntry(self.add_frame, placeholder_text="Brief description of the item", font=ctk.CTkFont(size=self.font_size))
         self.item_desc_entry.grid(row=3, column=0, padx=10, pady=5, sticky="ew")
 
+        self.item_tags_label = ctk.CTkLabel(self.add_frame, text="Tags:", font=ctk.CTkFont(size=self.font_size, weight="bold"))
+        self.item_tags_label.grid(row=4, column=0, padx=10, pady=(10, 5), sticky="w")
+        self.item_tags_entry = ctk.CTkEntry(self.add_frame, placeholder_text="Comma-separated, e.g. location:a1, bin:3, owner:sam", font=ctk.CTkFont(size=self.font_size))
+        self.item_tags_entry.grid(row=5, column=0, padx=10, pady=5, sticky="ew")
+
         self.add_button = ctk.CTkButton(self.add_frame, text="Generate QR", command=self.add_or_update_item, font=ctk.CTkFont(size=self.font_size))
-        self.add_button.grid(row=4, column=0, padx=10, pady=(10, 10))
+        self.add_button.grid(row=6, column=0, padx=10, pady=(10, 10))
 
         self.action_frame = ctk.CTkFrame(self.top_frame, corner_radius=10)
         self.action_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
@@ -508,15 +1579,54 @@ class InventoryManagerFrame(ctk.CTkFrame):
         
         self.export_button = ctk.CTkButton(self.action_frame, text="Export to PDF", command=self.export_to_pdf, font=ctk.CTkFont(size=self.font_size))
         self.export_button.grid(row=4, column=0, padx=20, pady=5, sticky="ew")
+
+        self.server_button = ctk.CTkButton(self.action_frame, text="Start Scan Server", command=self.toggle_server, font=ctk.CTkFont(size=self.font_size))
+        self.server_button.grid(row=5, column=0, padx=20, pady=5, sticky="ew")
+
+        self.reconcile_button = ctk.CTkButton(self.action_frame, text="Reconcile Scans", command=self.reconcile_scans, font=ctk.CTkFont(size=self.font_size))
+        self.reconcile_button.grid(row=6, column=0, padx=20, pady=5, sticky="ew")
         
-        self.search_entry = ctk.CTkEntry(self, placeholder_text="Search items by ID, name or description...", font=ctk.CTkFont(size=self.font_size))
-        self.search_entry.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="ew")
+        self.view_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.view_frame.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="ew")
+        self.view_frame.grid_columnconfigure(0, weight=1)
+
+        self.search_entry = ctk.CTkEntry(self.view_frame, placeholder_text="Search items by ID, name or description...", font=ctk.CTkFont(size=self.font_size))
+        self.search_entry.grid(row=0, column=0, sticky="ew")
         self.search_entry.bind("<KeyRelease>", self.filter_items)
 
+        self.sort_menu = ctk.CTkOptionMenu(self.view_frame, values=self.item_index.sort_modes, command=self.change_sort, font=ctk.CTkFont(size=self.font_size))
+        self.sort_menu.grid(row=0, column=1, padx=(10, 0))
+
+        self.order_menu = ctk.CTkOptionMenu(self.view_frame, values=["Ascending", "Descending"], command=self.change_sort, font=ctk.CTkFont(size=self.font_size))
+        self.order_menu.grid(row=0, column=2, padx=(10, 0))
+
+        self.tag_filter_entry = ctk.CTkEntry(self.view_frame, placeholder_text="Filter by tags, e.g. location:a1, owner:sam", font=ctk.CTkFont(size=self.font_size))
+        self.tag_filter_entry.grid(row=1, column=0, pady=(10, 0), sticky="ew")
+        self.tag_filter_entry.bind("<KeyRelease>", self.filter_items)
+
+        self.tag_mode_menu = ctk.CTkOptionMenu(self.view_frame, values=["Match Facets", "Any Tag"], command=self.change_sort, font=ctk.CTkFont(size=self.font_size))
+        self.tag_mode_menu.grid(row=1, column=1, columnspan=2, padx=(10, 0), pady=(10, 0), sticky="ew")
+
+        self.facet_label = ctk.CTkLabel(self.view_frame, text="", font=ctk.CTkFont(size=self.font_size - 2), text_color="#A9A9A9", wraplength=800, justify="left")
+        self.facet_label.grid(row=2, column=0, columnspan=3, pady=(5, 0), sticky="w")
+
         self.item_list_frame = ctk.CTkScrollableFrame(self, corner_radius=10)
-        self.item_list_frame.grid(row=2, column=0, padx=20, pady=(0, 20), sticky="nsew")
+        self.item_list_frame.grid(row=2, column=0, padx=20, pady=(0, 10), sticky="nsew")
         self.item_list_frame.grid_columnconfigure(1, weight=1)
 
+        self.pager_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.pager_frame.grid(row=3, column=0, padx=20, pady=(0, 20), sticky="ew")
+        self.pager_frame.grid_columnconfigure(1, weight=1)
+
+        self.prev_page_button = ctk.CTkButton(self.pager_frame, text="< Prev", width=80, command=self.previous_page, font=ctk.CTkFont(size=self.font_size))
+        self.prev_page_button.grid(row=0, column=0)
+
+        self.page_label = ctk.CTkLabel(self.pager_frame, text="", font=ctk.CTkFont(size=self.font_size))
+        self.page_label.grid(row=0, column=1)
+
+        self.next_page_button = ctk.CTkButton(self.pager_frame, text="Next >", width=80, command=self.next_page, font=ctk.CTkFont(size=self.font_size))
+        self.next_page_button.grid(row=0, column=2)
+
         self.display_items()
 
     def load_inventory(self):
@@ -538,23 +1648,27 @@ class InventoryManagerFrame(ctk.CTkFrame):
     def add_or_update_item(self):
         item_name = self.item_name_entry.get().strip()
         description = self.item_desc_entry.get().strip()
+        tags = TagIndex.parse_tags(self.item_tags_entry.get())
         if item_name and description:
             if self.editing_id is not None:
-                for item in self.inventory_items:
-                    if item["id"] == self.editing_id:
-                        item["name"] = item_name
-                        item["description"] = description
-                        break
+                item = self.item_index.get(self.editing_id)
+                if item:
+                    item["name"] = item_name
+                    item["description"] = description
+                    item["tags"] = tags
+                    self.item_index.update(item)
+                    self.server.invalidate(item["id"])
                 self.editing_id = None
                 self.add_button.configure(text="Generate QR")
             else:
                 new_id = str(uuid.uuid4())
-                self.inventory_items.append({"id": new_id, "name": item_name, "description": description})
+                self.item_index.add({"id": new_id, "name": item_name, "description": description, "tags": tags})
             
             self.save_inventory()
             self.display_items()
             self.item_name_entry.delete(0, "end")
             self.item_desc_entry.delete(0, "end")
+            self.item_tags_entry.delete(0, "end")
         else:
             tkinter.messagebox.showwarning("Warning", "Please fill in both the item name and description.")
 
@@ -564,32 +1678,85 @@ class InventoryManagerFrame(ctk.CTkFrame):
         self.item_name_entry.configure(font=ctk.CTkFont(size=self.font_size))
         self.item_desc_label.configure(font=ctk.CTkFont(size=self.font_size, weight="bold"))
         self.item_desc_entry.configure(font=ctk.CTkFont(size=self.font_size))
+        self.item_tags_label.configure(font=ctk.CTkFont(size=self.font_size, weight="bold"))
+        self.item_tags_entry.configure(font=ctk.CTkFont(size=self.font_size))
         self.add_button.configure(font=ctk.CTkFont(size=self.font_size))
         self.select_all_button.configure(font=ctk.CTkFont(size=self.font_size))
         self.deselect_all_button.configure(font=ctk.CTkFont(size=self.font_size))
         self.delete_selected_button.configure(font=ctk.CTkFont(size=self.font_size))
         self.export_qr_pdf_button.configure(font=ctk.CTkFont(size=self.font_size))
         self.export_button.configure(font=ctk.CTkFont(size=self.font_size))
+        self.server_button.configure(font=ctk.CTkFont(size=self.font_size))
+        self.reconcile_button.configure(font=ctk.CTkFont(size=self.font_size))
         self.search_entry.configure(font=ctk.CTkFont(size=self.font_size))
+        self.sort_menu.configure(font=ctk.CTkFont(size=self.font_size))
+        self.order_menu.configure(font=ctk.CTkFont(size=self.font_size))
+        self.prev_page_button.configure(font=ctk.CTkFont(size=self.font_size))
+        self.page_label.configure(font=ctk.CTkFont(size=self.font_size))
+        self.next_page_button.configure(font=ctk.CTkFont(size=self.font_size))
+        self.tag_filter_entry.configure(font=ctk.CTkFont(size=self.font_size))
+        self.tag_mode_menu.configure(font=ctk.CTkFont(size=self.font_size))
+        self.facet_label.configure(font=ctk.CTkFont(size=self.font_size - 2))
         self.display_items(self.search_entry.get().strip().lower())
         
     def filter_items(self, event=None):
+        self.current_page = 0
         self.display_items(self.search_entry.get().strip().lower())
 
+    def change_sort(self, _=None):
+        self.current_page = 0
+        self.display_items(self.search_entry.get().strip().lower())
+
+    def previous_page(self):
+        if self.current_page > 0:
+            self.current_page -= 1
+            self.display_items(self.search_entry.get().strip().lower())
+
+    def next_page(self):
+        self.current_page += 1
+        self.display_items(self.search_entry.get().strip().lower())
+
+    def get_search_predicate(self, search_query):
+        if not search_query:
+            return None
+        return lambda item: search_query in item["name"].lower() or search_query in item["description"].lower() or search_query in item["id"].lower()
+
+    def get_tag_filter_ids(self):
+        # None means no tag filter is active
+        tags = TagIndex.parse_tags(self.tag_filter_entry.get())
+        if not tags:
+            return None
+        return self.item_index.tag_index.match(tags, self.tag_mode_menu.get() == "Match Facets")
+
+    def toggle_selection(self, item_id, var):
+        if var.get() == 1:
+            self.selected_ids.add(item_id)
+        else:
+            self.selected_ids.discard(item_id)
+
+    def get_selected_items(self):
+        # Selected items in the current sort order
+        descending = self.order_menu.get() == "Descending"
+        selected_ids = self.selected_ids & self.item_index.by_id.keys()
+        selected_items, _ = self.item_index.page(self.sort_menu.get(), 0, len(selected_ids), descending, ids=selected_ids)
+        return selected_items
+
     def set_edit_mode(self, item_id):
         self.editing_id = item_id
-        item = next((item for item in self.inventory_items if item["id"] == item_id), None)
+        item = self.item_index.get(item_id)
         if item:
             self.item_name_entry.delete(0, "end")
             self.item_desc_entry.delete(0, "end")
+            self.item_tags_entry.delete(0, "end")
             self.item_name_entry.insert(0, item["name"])
             self.item_desc_entry.insert(0, item["description"])
+            self.item_tags_entry.insert(0, TagIndex.format_tags(item.get("tags", [])))
             self.add_button.configure(text="Update Item")
 
     def show_qr_code(self, item_id, name):
         try:
             qr = qrcode.QRCode(version=1, box_size=10, border=4)
-            qr.add_data(item_id)
+            qr.add_data(self.get_item_qr_data(item_id))
             qr.make(fit=True)
             img = qr.make_image(fill_color="black", back_color="white").resize((300, 300))
             qr_window = ctk.CTkToplevel(self.master.master)
@@ -605,150 +1772,277 @@ class InventoryManagerFrame(ctk.CTkFrame):
 
     def delete_item(self, item_id):
         if tkinter.messagebox.askyesno("Confirm Delete", f"Delete item '{item_id}'?"):
-            self.inventory_items = [item for item in self.inventory_items if item["id"] != item_id]
+            self.item_index.remove([item_id])
+            self.selected_ids.discard(item_id)
+            self.server.invalidate(item_id)
             self.save_inventory()
             self.display_items()
 
     def delete_selected_items(self):
-        selected_ids = [item["id"] for item in self.inventory_items if self.checkbox_vars[item["id"]].get() == 1]
+        selected_ids = self.selected_ids & self.item_index.by_id.keys()
         if not selected_ids:
             tkinter.messagebox.showwarning("Warning", "Please select at least one item to delete.")
             return
         if tkinter.messagebox.askyesno("Confirm Bulk Delete", f"Delete {len(selected_ids)} selected item(s)?"):
-            self.inventory_items = [item for item in self.inventory_items if item["id"] not in selected_ids]
+            self.item_index.remove(selected_ids)
+            self.selected_ids -= selected_ids
+            for item_id in selected_ids:
+                self.server.invalidate(item_id)
             self.save_inventory()
             self.display_items()
 
     def select_all_items(self):
+        # Selects every item matching the search and tag filter, not just the ones on the current page
+        predicate = self.get_search_predicate(self.search_entry.get().strip().lower())
+        self.selected_ids.update(self.item_index.matching_ids(self.get_tag_filter_ids(), predicate))
         for var in self.checkbox_vars.values():
             var.set(1)
 
     def deselect_all_items(self):
+        self.selected_ids.clear()
         for var in self.checkbox_vars.values():
             var.set(0)
 
+    def toggle_server(self):
+        if self.server.is_running:
+            self.server.stop()
+            self.server_button.configure(text="Start Scan Server")
+            return
+        try:
+            self.server.start()
+        except OSError as e:
+            tkinter.messagebox.showerror("Error", f"Failed to start the scan server: {e}")
+            return
+        self.server_button.configure(text="Stop Scan Server")
+        tkinter.messagebox.showinfo("Scan Server", f"Scan server running at:\n{self.server.base_url}\n\nQR codes generated while it runs open item pages and PDFs from this address.")
+
+    def reconcile_scans(self):
+        if self.reconcile_thread is not None and self.reconcile_thread.is_alive():
+            return
+        if cv2 is None:
+            tkinter.messagebox.showerror("Error", "Batch reconciliation needs OpenCV. Install it with:\npip install opencv-python-headless")
+            return
+        folder = filedialog.askdirectory(title="Select a folder of scan images")
+        if not folder:
+            return
+        # Reconcile against the selected items, or every item matching the current filters
+        expected_ids = self.selected_ids & self.item_index.by_id.keys()
+        if not expected_ids:
+            expected_ids = self.item_index.matching_ids(self.get_tag_filter_ids(), self.get_search_predicate(self.search_entry.get().strip().lower()))
+        self.reconcile_result = None
+        self.reconcile_button.configure(text="Reconciling...", state="disabled")
+        self.reconcile_thread = threading.Thread(target=self.run_reconcile, args=(folder, expected_ids), daemon=True)
+        self.reconcile_thread.start()
+        self.after(200, self.poll_reconcile)
+
+    def run_reconcile(self, folder, expected_ids):
+        try:
+            self.reconcile_result = self.reconciler.reconcile(ScanReconciler.find_images(folder), expected_ids)
+        except Exception as e:
+            self.reconcile_result = e
+
+    def poll_reconcile(self):
+        # Tkinter widgets must only be touched from the main thread, so poll for completion
+        if self.reconcile_thread.is_alive():
+            self.after(200, self.poll_reconcile)
+            return
+        self.reconcile_button.configure(text="Reconcile Scans", state="normal")
+        if isinstance(self.reconcile_result, Exception):
+            tkinter.messagebox.showerror("Error", f"Failed to reconcile scans: {self.reconcile_result}")
+        else:
+            self.show_reconcile_report(self.reconcile_result)
+
+    def show_reconcile_report(self, report):
+        found = sorted((self.item_index.get(item_id) for item_id in report["found"] if self.item_index.get(item_id)), key=lambda item: item["name"].lower())
+        missing = sorted((self.item_index.get(item_id) for item_id in report["missing"] if self.item_index.get(item_id)), key=lambda item: item["name"].lower())
+
+        lines = [f"Missing ({len(missing)}):"]
+        lines += [f"  {item['name']} ({item['id']})" for item in missing]
+        lines += ["", f"Unknown QR codes ({len(report['unknown'])}):"]
+        lines += [f"  {payload} - in {len(paths)} image(s), e.g. {paths[0]}" for payload, paths in sorted(report["unknown"].items())]
+        lines += ["", f"Found ({len(found)}):"]
+        lines += [f"  {item['name']} ({item['id']})" for item in found]
+        if report["errors"]:
+            lines += ["", f"Unreadable images ({len(report['errors'])}):"]
+            lines += [f"  {path}: {error}" for path, error in report["errors"]]
+
+        report_window = ctk.CTkToplevel(self)
+        report_window.title("Scan Reconciliation")
+        report_window.geometry("640x520")
+
+        summary = f"{report['images']} image(s) scanned: {len(found)} found, {len(missing)} missing, {len(report['unknown'])} unknown"
+        ctk.CTkLabel(report_window, text=summary, font=ctk.CTkFont(size=self.font_size, weight="bold")).pack(padx=20, pady=(20, 10))
+
+        textbox = ctk.CTkTextbox(report_window, font=ctk.CTkFont(size=self.font_size - 2))
+        textbox.pack(fill="both", expand=True, padx=20, pady=10)
+        textbox.insert("end", "\n".join(lines))
+        textbox.configure(state="disabled")
+
+        ctk.CTkButton(report_window, text="Select Missing Items", command=lambda: self.select_items([item["id"] for item in missing]), font=ctk.CTkFont(size=self.font_size)).pack(pady=(0, 20))
+
+    def select_items(self, item_ids):
+        self.selected_ids = set(item_ids)
+        self.display_items(self.search_entry.get().strip().lower())
+
+    def get_item_qr_data(self, item_id):
+        # Encode a scannable URL while the server runs; otherwise fall back to the bare id
+        if self.server.is_running:
+            return self.server.item_url(item_id)
+        return item_id
+
     def export_to_pdf(self):
-        selected_items = [item for item in self.inventory_items if self.checkbox_vars[item["id"]].get() == 1]
+        selected_items = self.get_selected_items()
         if not selected_items:
             tkinter.messagebox.showwarning("Warning", "Please select at least one item to export.")
             return
-        filename = "exported_inventory.pdf"
-        c = pdf_canvas.Canvas(filename, pagesize=letter)
+
         margin = 50
-        y_pos = letter[1] - margin
         qr_size = 120
-        # Horizontal positions for the 3 columns
-        col1_x = margin
-        col2_x = margin + qr_size + 20
-        col3_x = col2_x + qr_size + 20
-        c.setFont("Helvetica-Bold", 18)
-        c.drawString(margin, y_pos, "Inventory QR Codes")
-        y_pos -= 30
-
-        for i, item in enumerate(selected_items):
-            # Determine the column for the current link
-            col_index = i % 3
-            current_x = margin + col_index * (qr_size + 20)
-            
-            # Move to a new row if starting a new set of 3
-            if col_index == 0 and i > 0:
-                y_pos -= (qr_size + 40)
-            
-            # Check for new page
-            if y_pos < margin + (qr_size + 40):
-                c.showPage()
-                y_pos = letter[1] - margin
-                c.setFont("Helvetica-Bold", 18)
-                c.drawString(margin, y_pos, "Inventory QR Codes (cont.)")
-                y_pos -= 30
-                current_x = margin
-                
-            try:
-                qr = qrcode.QRCode(version=1, box_size=5, border=4)
-                qr.add_data(item['id'])
-                qr.make(fit=True)
-                img = qr.make_image(fill_color="black", back_color="white")
-                img_buffer = io.BytesIO()
-                img.save(img_buffer, "PNG")
-
-                qr_y = y_pos - qr_size
-                c.drawImage(ImageReader(img_buffer), current_x, qr_y, width=qr_size, height=qr_size)
-
-                # Draw item name (truncated if too long)
-                c.setFont("Helvetica-Bold", 12)
-                name_to_display = item['name']
-                max_width = qr_size
-                if c.stringWidth(name_to_display) > max_width:
-                    while c.stringWidth(name_to_display + "...") > max_width:
-                        name_to_display = name_to_display[:-1]
-                    name_to_display += "..."
-                c.drawString(current_x, qr_y - 15, name_to_display)
-                
-                # Draw description (truncated if too long)
-                c.setFont("Helvetica", 8)
-                desc_to_display = item['description']
-                if c.stringWidth(desc_to_display) > max_width:
-                    while c.stringWidth(desc_to_display + "...") > max_width:
-                        desc_to_display = desc_to_display[:-1]
-                    desc_to_display += "..."
-                c.drawString(current_x, qr_y - 25, desc_to_display)
-                
-                # Make name and description clickable, linking to the exported PDF
-                link_target = os.path.abspath(filename)
-                c.linkURL(link_target, (current_x, qr_y - 15, current_x + c.stringWidth(name_to_display), qr_y - 15 + 12))
-                c.linkURL(link_target, (current_x, qr_y - 25, current_x + c.stringWidth(desc_to_display), qr_y - 25 + 8))
-
-            except Exception as e:
-                tkinter.messagebox.showerror("Error", f"Failed to generate QR for {item['name']}: {e}")
-        c.save()
+        records = [{"name": item["name"], "description": item["description"], "qr_data": self.get_item_qr_data(item["id"])} for item in selected_items]
+        key = self.export_cache.make_key("inventory", records, margin=margin, qr_size=qr_size, columns=3)
+        filename = self.export_cache.path_for("inventory", key, ".pdf")
+
+        def build(temp_filename):
+            c = pdf_canvas.Canvas(temp_filename, pagesize=letter)
+            y_pos = letter[1] - margin
+            c.setFont("Helvetica-Bold", 18)
+            c.drawString(margin, y_pos, "Inventory QR Codes")
+            y_pos -= 30
+
+            for i, item in enumerate(records):
+                # Determine the column for the current link
+                col_index = i % 3
+                current_x = margin + col_index * (qr_size + 20)
+
+                # Move to a new row if starting a new set of 3
+                if col_index == 0 and i > 0:
+                    y_pos -= (qr_size + 40)
+
+                # Check for new page
+                if y_pos < margin + (qr_size + 40):
+                    c.showPage()
+                    y_pos = letter[1] - margin
+                    c.setFont("Helvetica-Bold", 18)
+                    c.drawString(margin, y_pos, "Inventory QR Codes (cont.)")
+                    y_pos -= 30
+                    current_x = margin
+
+                try:
+                    qr = qrcode.QRCode(version=1, box_size=5, border=4)
+                    qr.add_data(item['qr_data'])
+                    qr.make(fit=True)
+                    img = qr.make_image(fill_color="black", back_color="white")
+                    img_buffer = io.BytesIO()
+                    img.save(img_buffer, "PNG")
+
+                    qr_y = y_pos - qr_size
+                    c.drawImage(ImageReader(img_buffer), current_x, qr_y, width=qr_size, height=qr_size)
+
+                    # Draw item name (truncated if too long)
+                    c.setFont("Helvetica-Bold", 12)
+                    name_to_display = item['name']
+                    max_width = qr_size
+                    if c.stringWidth(name_to_display) > max_width:
+                        while c.stringWidth(name_to_display + "...") > max_width:
+                            name_to_display = name_to_display[:-1]
+                        name_to_display += "..."
+                    c.drawString(current_x, qr_y - 15, name_to_display)
+
+                    # Draw description (truncated if too long)
+                    c.setFont("Helvetica", 8)
+                    desc_to_display = item['description']
+                    if c.stringWidth(desc_to_display) > max_width:
+                        while c.stringWidth(desc_to_display + "...") > max_width:
+                            desc_to_display = desc_to_display[:-1]
+                        desc_to_display += "..."
+                    c.drawString(current_x, qr_y - 25, desc_to_display)
+
+                    # Make name and description clickable, linking to the item page or the exported PDF
+                    link_target = item['qr_data'] if self.server.is_running else os.path.abspath(filename)
+                    c.linkURL(link_target, (current_x, qr_y - 15, current_x + c.stringWidth(name_to_display), qr_y - 15 + 12))
+                    c.linkURL(link_target, (current_x, qr_y - 25, current_x + c.stringWidth(desc_to_display), qr_y - 25 + 8))
+
+                except Exception as e:
+                    # Abort the build so a PDF with missing codes is never cached
+                    raise RuntimeError(f"Failed to generate QR for {item['name']}: {e}") from e
+            c.save()
+
+        try:
+            self.export_cache.get_or_create("inventory", key, ".pdf", build)
+        except Exception as e:
+            tkinter.messagebox.showerror("Error", f"Failed to export PDF: {e}")
+            return
         tkinter.messagebox.showinfo("Export Complete", f"PDF exported successfully:\n{os.path.abspath(filename)}")
 
     def export_multi_qr_to_pdf(self):
-        selected_items = [item for item in self.inventory_items if self.checkbox_vars[item["id"]].get() == 1]
+        selected_items = self.get_selected_items()
         if not selected_items:
             tkinter.messagebox.showwarning("Warning", "Please select at least one item to export.")
             return
 
-        # 1. Create a PDF with all selected items and their details.
-        pdf_filename = os.path.join(self.PDF_DIRECTORY, f"inventory_export_{uuid.uuid4().hex[:8]}.pdf")
-        c = pdf_canvas.Canvas(pdf_filename, pagesize=letter)
-        c.setFont("Helvetica-Bold", 24)
-        c.drawString(50, 750, "Inventory Collection Details")
-        y_pos = 720
-        c.setFont("Helvetica", 12)
-        for i, item in enumerate(selected_items):
-            if y_pos < 100:
-                c.showPage()
-                y_pos = 750
-                c.setFont("Helvetica-Bold", 24)
-                c.drawString(50, y_pos, "Inventory Collection Details (cont.)")
-                y_pos -= 30
-                c.setFont("Helvetica", 12)
-
-            c.drawString(70, y_pos, f"Item Name: {item['name']}")
-            y_pos -= 15
-            c.drawString(70, y_pos, f"Description: {item['description']}")
-            y_pos -= 15
-            c.drawString(70, y_pos, f"Unique ID: {item['id']}")
-            y_pos -= 25
-            if i < len(selected_items) - 1:
-                c.line(50, y_pos, 550, y_pos)
+        # 1. Create a PDF with all selected items and their details, reusing an identical earlier export.
+        margin = 50
+        title_size = 24
+        text_size = 12
+        records = [{"id": item["id"], "name": item["name"], "description": item["description"]} for item in selected_items]
+        pdf_key = self.export_cache.make_key("inventory_export", records, margin=margin, title_size=title_size, text_size=text_size)
+
+        def build_pdf(temp_filename):
+            c = pdf_canvas.Canvas(temp_filename, pagesize=letter)
+            c.setFont("Helvetica-Bold", title_size)
+            c.drawString(margin, 750, "Inventory Collection Details")
+            y_pos = 720
+            c.setFont("Helvetica", text_size)
+            for i, item in enumerate(records):
+                if y_pos < 100:
+                    c.showPage()
+                    y_pos = 750
+                    c.setFont("Helvetica-Bold", title_size)
+                    c.drawString(margin, y_pos, "Inventory Collection Details (cont.)")
+                    y_pos -= 30
+                    c.setFont("Helvetica", text_size)
+
+                c.drawString(margin + 20, y_pos, f"Item Name: {item['name']}")
                 y_pos -= 15
-        
-        c.save()
+                c.drawString(margin + 20, y_pos, f"Description: {item['description']}")
+                y_pos -= 15
+                c.drawString(margin + 20, y_pos, f"Unique ID: {item['id']}")
+                y_pos -= 25
+                if i < len(records) - 1:
+                    c.line(margin, y_pos, 550, y_pos)
+                    y_pos -= 15
+
+            c.save()
+
+        try:
+            pdf_filename, _ = self.export_cache.get_or_create("inventory_export", pdf_key, ".pdf", build_pdf)
+        except Exception as e:
+            tkinter.messagebox.showerror("Error", f"Failed to export PDF: {e}")
+            return
 
         # 2. Create a single QR code that links to the PDF.
-        qr_filename = os.path.join(self.PDF_DIRECTORY, f"qr_code_{uuid.uuid4().hex[:8]}.png")
-        qr_data = os.path.abspath(pdf_filename)
-        
-        qr = qrcode.QRCode(version=1, box_size=10, border=4)
-        qr.add_data(qr_data)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-        img.save(qr_filename)
+        qr_data = self.server.pdf_url(pdf_filename) if self.server.is_running else os.path.abspath(pdf_filename)
+
+        box_size = 10
+        border = 4
+
+        def build_qr(temp_filename):
+            qr = qrcode.QRCode(version=1, box_size=box_size, border=border)
+            qr.add_data(qr_data)
+            qr.make(fit=True)
+            qr.make_image(fill_color="black", back_color="white").save(temp_filename)
+
+        try:
+            qr_filename, _ = self.export_cache.get_or_create("qr_code", self.export_cache.make_key("qr_code", [], data=qr_data, box_size=box_size, border=border), ".png", build_qr)
+        except Exception as e:
+            tkinter.messagebox.showerror("Error", f"Failed to generate QR code: {e}")
+            return
 
         # 3. Display the single QR code to the user.
         try:
+            with Image.open(qr_filename) as qr_image:
+                img = qr_image.copy()
+
             qr_window = ctk.CTkToplevel(self)
             qr_window.title("QR Code for Inventory PDF")
             qr_window.geometry("500x550")
@@ -772,17 +2066,36 @@ class InventoryManagerFrame(ctk.CTkFrame):
         for widget in self.item_list_frame.winfo_children():
             widget.destroy()
         self.checkbox_vars = {}
-        filtered_items = [(i, l) for i, l in enumerate(self.inventory_items) if search_query in l["name"].lower() or search_query in l["description"].lower() or search_query in l["id"].lower()]
-        if not filtered_items:
+        sort_mode = self.sort_menu.get()
+        descending = self.order_menu.get() == "Descending"
+        predicate = self.get_search_predicate(search_query)
+        tag_ids = self.get_tag_filter_ids()
+        page_items, total = self.item_index.page(sort_mode, self.current_page * self.PAGE_SIZE, self.PAGE_SIZE, descending, predicate, tag_ids)
+        page_count = max(-(-total // self.PAGE_SIZE), 1)
+        if self.current_page >= page_count:
+            # The page no longer exists after a delete or a narrower search
+            self.current_page = page_count - 1
+            page_items, total = self.item_index.page(sort_mode, self.current_page * self.PAGE_SIZE, self.PAGE_SIZE, descending, predicate, tag_ids)
+        self.page_label.configure(text=f"Page {self.current_page + 1} of {page_count} ({total} items)")
+        candidate_ids = None if predicate is None and tag_ids is None else self.item_index.matching_ids(tag_ids, predicate)
+        facets = TagIndex.format_facets(self.item_index.tag_index.facet_counts(candidate_ids))
+        self.facet_label.configure(text=facets)
+        self.prev_page_button.configure(state="normal" if self.current_page > 0 else "disabled")
+        self.next_page_button.configure(state="normal" if self.current_page < page_count - 1 else "disabled")
+
+        if not page_items:
             ctk.CTkLabel(self.item_list_frame, text="No inventory items found.", font=ctk.CTkFont(size=self.font_size)).grid(row=0, column=0, pady=20)
-        for i, (idx, item) in enumerate(filtered_items):
+        for i, item in enumerate(page_items):
             item_card = ctk.CTkFrame(self.item_list_frame, corner_radius=8)
             item_card.grid(row=i, column=0, padx=10, pady=5, sticky="ew")
             item_card.grid_columnconfigure(1, weight=1)
-            self.checkbox_vars[item["id"]] = ctk.IntVar(value=0)
-            ctk.CTkCheckBox(item_card, text="", variable=self.checkbox_vars[item["id"]]).grid(row=0, column=0, rowspan=2, padx=(10, 0), pady=10, sticky="w")
+            var = ctk.IntVar(value=1 if item["id"] in self.selected_ids else 0)
+            self.checkbox_vars[item["id"]] = var
+            ctk.CTkCheckBox(item_card, text="", variable=var, command=lambda i=item["id"], v=var: self.toggle_selection(i, v)).grid(row=0, column=0, rowspan=2, padx=(10, 0), pady=10, sticky="w")
             ctk.CTkLabel(item_card, text=item["name"], font=ctk.CTkFont(size=self.font_size, weight="bold")).grid(row=0, column=1, padx=(5, 5), pady=5, sticky="w")
             ctk.CTkLabel(item_card, text=f"Description: {item['description']}", font=ctk.CTkFont(size=self.font_size-2), text_color="#A9A9A9").grid(row=1, column=1, padx=(5, 5), pady=5, sticky="w")
+            if item.get("tags"):
+                ctk.CTkLabel(item_card, text=f"Tags: {TagIndex.format_tags(item['tags'])}", font=ctk.CTkFont(size=self.font_size-2), text_color="#A9A9A9").grid(row=2, column=1, padx=(5, 5), pady=(0, 5), sticky="w")
             act = ctk.CTkFrame(item_card, corner_radius=0, fg_color="transparent")
             act.grid(row=0, column=2, rowspan=2, padx=(5, 10), pady=5, sticky="e")
             act.grid_columnconfigure((0, 1, 2), weight=1)
@@ -791,5 +2104,6 @@ class InventoryManagerFrame(ctk.CTkFrame):
             ctk.CTkButton(act, text="Delete", command=lambda i=item['id']: self.delete_item(i), width=80, fg_color="#F44336", hover_color="#D32F2F", font=ctk.CTkFont(size=self.font_size-2)).grid(row=0, column=2, padx=5, pady=5)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Needed by the scan reconciliation process pool in compiled executables
     app = LinkitApp()
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import os
+import time
+
+import pytest
+
+from linkit import ExportCache
+
+
+def write(content):
+    def build(path):
+        with open(path, "w") as f:
+            f.write(content)
+    return build
+
+
+def test_repeated_export_reuses_file(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    key = cache.make_key("links", [{"name": "a"}])
+    path, created = cache.get_or_create("links", key, ".pdf", write("first"))
+    again, created_again = cache.get_or_create("links", key, ".pdf", write("second"))
+    assert (created, created_again) == (True, False)
+    assert again == path
+    assert open(path).read() == "first"
+
+
+def test_failed_build_is_not_cached(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    key = cache.make_key("links", [{"name": "a"}])
+
+    def partial(path):
+        write("partial")(path)
+        raise RuntimeError("Failed to generate QR for a")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_create("links", key, ".pdf", partial)
+    assert list(tmp_path.iterdir()) == []
+
+    path, created = cache.get_or_create("links", key, ".pdf", write("complete"))
+    assert created
+    assert open(path).read() == "complete"
+
+
+def test_eviction_keeps_kept_kinds_past_age_limit(tmp_path):
+    cache = ExportCache(str(tmp_path), max_bytes=20, max_age_days=30, keep_kinds=("inventory_export",))
+    old = time.time() - 60 * 24 * 60 * 60
+    paths = {}
+    for kind in ("inventory", "inventory_export"):
+        paths[kind], _ = cache.get_or_create(kind, cache.make_key(kind, []), ".pdf", write("x" * 5))
+        os.utime(paths[kind], (old, old))
+
+    cache.evict()
+    assert not os.path.exists(paths["inventory"])
+    assert os.path.exists(paths["inventory_export"])
+
+    # The size limit still applies to kept kinds
+    cache.get_or_create("links", cache.make_key("links", []), ".pdf", write("x" * 18))
+    assert not os.path.exists(paths["inventory_export"])
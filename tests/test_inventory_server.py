@@ -0,0 +1,117 @@
+import socket
+import threading
+
+import pytest
+
+from linkit import InventoryServer
+
+
+def request(server, method, path):
+    """Sends one raw HTTP request and returns (status, body)."""
+    with socket.create_connection(("127.0.0.1", server.port), timeout=5) as sock:
+        sock.sendall(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        data = b""
+        while chunk := sock.recv(65536):
+            data += chunk
+    head, _, body = data.partition(b"\r\n\r\n")
+    return int(head.split()[1]), body
+
+
+@pytest.fixture
+def items():
+    return {"a": {"id": "a", "name": "Drill", "description": "Cordless", "tags": ["location:a1"]}}
+
+
+@pytest.fixture
+def server(items, tmp_path):
+    (tmp_path / "collection.pdf").write_bytes(b"%PDF-1.4 test")
+    (tmp_path.parent / "outside.pdf").write_bytes(b"%PDF-1.4 secret")
+    server = InventoryServer(items.get, str(tmp_path), host="127.0.0.1", port=0)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_item_page(server):
+    status, body = request(server, "GET", "/items/a")
+    assert status == 200
+    assert b"Drill" in body and b"location:a1" in body
+
+
+def test_unknown_item_and_path(server):
+    assert request(server, "GET", "/items/missing")[0] == 404
+    assert request(server, "GET", "/")[0] == 404
+
+
+def test_head_has_no_body(server):
+    status, body = request(server, "HEAD", "/items/a")
+    assert status == 200
+    assert body == b""
+
+
+def test_unsupported_method(server):
+    assert request(server, "POST", "/items/a")[0] == 405
+
+
+def test_serves_exported_pdf(server):
+    status, body = request(server, "GET", "/exports/collection.pdf")
+    assert status == 200
+    assert body == b"%PDF-1.4 test"
+
+
+@pytest.mark.parametrize("path", ["/exports/../outside.pdf", "/exports/..%2Foutside.pdf", "/exports/collection.txt", "/exports/a%00.pdf"])
+def test_rejects_paths_outside_export_directory(server, path):
+    assert request(server, "GET", path)[0] == 404
+
+
+def test_failed_request_gets_500(tmp_path):
+    def broken_lookup(item_id):
+        raise RuntimeError("lookup failed")
+
+    server = InventoryServer(broken_lookup, str(tmp_path), host="127.0.0.1", port=0)
+    server.start()
+    try:
+        assert request(server, "GET", "/items/a")[0] == 500
+        assert request(server, "GET", "/exports/missing.pdf")[0] == 404
+    finally:
+        server.stop()
+
+
+def test_invalidate_refreshes_page(server, items):
+    assert b"Drill" in request(server, "GET", "/items/a")[1]
+    items["a"]["name"] = "Hammer"
+    assert b"Drill" in request(server, "GET", "/items/a")[1]
+    server.invalidate("a")
+    assert b"Hammer" in request(server, "GET", "/items/a")[1]
+
+
+def test_invalidate_during_render_is_not_lost(items, tmp_path):
+    rendering = threading.Event()
+    resume = threading.Event()
+
+    class SlowServer(InventoryServer):
+        def render_item_page(self, item):
+            page = super().render_item_page(item)
+            rendering.set()
+            resume.wait(5)
+            return page
+
+    server = SlowServer(items.get, str(tmp_path), host="127.0.0.1", port=0)
+    worker = threading.Thread(target=server.get_item_page, args=("a",))
+    worker.start()
+    rendering.wait(5)
+    items["a"]["name"] = "Hammer"
+    server.invalidate("a")
+    resume.set()
+    worker.join()
+    assert b"Hammer" in server.get_item_page("a")
+
+
+def test_stop_and_restart(server):
+    server.stop()
+    assert not server.is_running
+    with pytest.raises(OSError):
+        request(server, "GET", "/items/a")
+    server.start()
+    assert server.is_running
+    assert request(server, "GET", "/items/a")[0] == 200
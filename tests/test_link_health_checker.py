@@ -0,0 +1,142 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from linkit import LinkHealthChecker
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self, status, headers=(), body=b""):
+        self.server.requests.append((self.command, self.path, dict(self.headers)))
+        self.server.clients.add(self.client_address)
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        if self.path == "/no-head":
+            self.respond(405)
+        elif self.path == "/slow":
+            time.sleep(1)
+            self.respond(200)
+        elif self.path == "/gone":
+            self.respond(404)
+        elif self.path == "/moved":
+            self.respond(301, [("Location", "/page")])
+        elif self.path == "/moved-to-dead":
+            self.respond(302, [("Location", "/gone")])
+        elif self.path == "/loop":
+            self.respond(302, [("Location", "/loop")])
+        elif self.headers.get("If-None-Match") == '"v1"':
+            self.respond(304)
+        else:
+            self.respond(200, [("ETag", '"v1"'), ("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")])
+
+    def do_GET(self):
+        self.respond(200, body=b"<html>ok</html>")
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.requests = []
+    server.clients = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.base_url = f"http://127.0.0.1:{server.server_port}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def checker(tmp_path):
+    return LinkHealthChecker(cache_file=str(tmp_path / "health.json"), per_host_limit=2, timeout=5)
+
+
+def test_ok_stores_validators(server, checker):
+    result = checker.check_all([server.base_url + "/page"])[server.base_url + "/page"]
+    assert result["status"] == 200
+    assert result["etag"] == '"v1"'
+    assert result["last_modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+def test_recheck_is_conditional(server, checker, tmp_path):
+    url = server.base_url + "/page"
+    checker.check_all([url])
+    server.requests.clear()
+
+    # A fresh checker reads the persisted cache
+    recheck = LinkHealthChecker(cache_file=str(tmp_path / "health.json"))
+    result = recheck.check_all([url])[url]
+    assert server.requests[0][2]["If-None-Match"] == '"v1"'
+    assert result["status"] == 200
+    assert result["etag"] == '"v1"'
+
+
+def test_falls_back_to_get_when_head_is_refused(server, checker):
+    result = checker.check_all([server.base_url + "/no-head"])[server.base_url + "/no-head"]
+    assert result["status"] == 200
+    assert [method for method, _, _ in server.requests] == ["HEAD", "GET"]
+
+
+def test_dead_link(server, checker):
+    assert checker.check_all([server.base_url + "/gone"])[server.base_url + "/gone"]["status"] == 404
+
+
+def test_follows_redirects(server, checker):
+    results = checker.check_all([server.base_url + "/moved", server.base_url + "/moved-to-dead", server.base_url + "/loop"])
+    moved = results[server.base_url + "/moved"]
+    assert moved["status"] == 200
+    assert moved["redirected_to"] == server.base_url + "/page"
+    assert results[server.base_url + "/moved-to-dead"]["status"] == 404
+    assert results[server.base_url + "/loop"]["error"] == "Too many redirects"
+
+
+def test_timeout(server, tmp_path):
+    checker = LinkHealthChecker(cache_file=str(tmp_path / "health.json"), timeout=0.2)
+    result = checker.check_all([server.base_url + "/slow"])[server.base_url + "/slow"]
+    assert result["status"] is None
+    assert result["error"] == "TimeoutError"
+
+
+def test_connection_refused(checker):
+    # Bind and release a port so nothing is listening on it
+    probe = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    port = probe.server_port
+    probe.server_close()
+    result = checker.check_all([f"http://127.0.0.1:{port}/"])[f"http://127.0.0.1:{port}/"]
+    assert result["status"] is None
+    assert result["error"]
+
+
+def test_reuses_pooled_connections(server, checker):
+    urls = [f"{server.base_url}/page{i}" for i in range(20)]
+    results = checker.check_all(urls)
+    assert all(result["status"] == 200 for result in results.values())
+    # per_host_limit=2 caps the number of connections opened to the host
+    assert len(server.clients) <= 2
+
+
+def test_encodes_non_ascii_and_spaces(server, checker):
+    urls = [server.base_url + "/wiki/مصر", server.base_url + "/my page?q=a b", server.base_url + "/already%20encoded"]
+    results = checker.check_all(urls)
+    assert all(results[url]["status"] == 200 for url in urls)
+    assert sorted(path for _, path, _ in server.requests) == ["/already%20encoded", "/my%20page?q=a%20b", "/wiki/%D9%85%D8%B5%D8%B1"]
+    assert {headers["Host"] for _, _, headers in server.requests} == {f"127.0.0.1:{server.server_port}"}
+
+
+def test_only_http_links_can_be_checked():
+    assert LinkHealthChecker.can_check("https://example.com/")
+    assert LinkHealthChecker.can_check("HTTP://example.com/")
+    assert not LinkHealthChecker.can_check("ftp://example.com/file.txt")
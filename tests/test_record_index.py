@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from linkit import RecordIndex
+
+
+def make_index(count=100):
+    rng = random.Random(7)
+    # Few distinct names so ties fall back to the id
+    records = [{"id": f"{n:03d}", "name": rng.choice(["Drill", "Saw", "Tape", "Glue", "Vise"])} for n in range(count)]
+    return RecordIndex(records, {"Name": lambda record: record["name"].lower()})
+
+
+def expected_ids(index, mode, descending=False, ids=None):
+    """Naive reference order: a full sort of the current records."""
+    if mode == RecordIndex.DATE_ADDED:
+        ordered = [record["id"] for record in index.records]
+    else:
+        ordered = [record["id"] for record in sorted(index.records, key=lambda record: (record["name"].lower(), record["id"]))]
+    if descending:
+        ordered.reverse()
+    return [record_id for record_id in ordered if ids is None or record_id in ids]
+
+
+def page_ids(index, *args, **kwargs):
+    records, total = index.page(*args, **kwargs)
+    return [record["id"] for record in records], total
+
+
+def test_sort_modes_start_with_date_added():
+    assert make_index().sort_modes == [RecordIndex.DATE_ADDED, "Name"]
+
+
+@pytest.mark.parametrize("mode", [RecordIndex.DATE_ADDED, "Name"])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("offset", [0, 30, 90, 100, 150])
+def test_page_slices_match_full_sort(mode, descending, offset):
+    index = make_index()
+    ids, total = page_ids(index, mode, offset, 25, descending)
+    assert total == 100
+    assert ids == expected_ids(index, mode, descending)[offset:offset + 25]
+
+
+def test_added_records_are_newest():
+    index = make_index()
+    index.add({"id": "new", "name": "Anvil"})
+    assert page_ids(index, RecordIndex.DATE_ADDED, 0, 1, descending=True)[0] == ["new"]
+    assert page_ids(index, "Name", 0, 1)[0] == ["new"]
+
+
+def test_update_moves_record():
+    index = make_index()
+    record = index.get("050")
+    record["name"] = "Zzz"
+    index.update(record)
+    assert page_ids(index, "Name", 0, 1, descending=True)[0] == ["050"]
+    assert page_ids(index, "Name", 0, 100)[0] == expected_ids(index, "Name")
+    # Editing a field does not change when the record was added
+    assert page_ids(index, RecordIndex.DATE_ADDED, 50, 1)[0] == ["050"]
+
+
+def test_remove_single_and_bulk():
+    index = make_index()
+    index.remove(["010"])
+    index.remove(["020", "021", "099", "missing"])
+    assert len(index) == 96
+    assert index.get("020") is None
+    for mode in (RecordIndex.DATE_ADDED, "Name"):
+        assert page_ids(index, mode, 0, 100) == (expected_ids(index, mode), 96)
+
+
+@pytest.mark.parametrize("candidates", [{"003", "040", "077"}, {f"{n:03d}" for n in range(0, 100, 2)}])
+@pytest.mark.parametrize("descending", [False, True])
+def test_candidate_ids_sorted_like_full_order(candidates, descending):
+    # Three ids take the small-set sort; fifty take the walk over the order index
+    index = make_index()
+    ids, total = page_ids(index, "Name", 1, 10, descending, ids=candidates)
+    assert total == len(candidates)
+    assert ids == expected_ids(index, "Name", descending, candidates)[1:11]
+
+
+def test_predicate_counts_all_matches():
+    index = make_index()
+    is_saw = lambda record: record["name"] == "Saw"
+    saws = {record["id"] for record in index.records if is_saw(record)}
+    ids, total = page_ids(index, "Name", 2, 5, True, predicate=is_saw)
+    assert total == len(saws)
+    assert ids == expected_ids(index, "Name", True, saws)[2:7]
+
+
+def test_random_edits_keep_orders_consistent():
+    index = make_index()
+    rng = random.Random(11)
+    for step in range(300):
+        action = rng.choice(["add", "update", "remove", "remove_many"])
+        if action == "add":
+            index.add({"id": f"n{step}", "name": rng.choice(["Drill", "Saw", "Bolt"])})
+        elif action == "update" and index.records:
+            record = rng.choice(index.records)
+            record["name"] = rng.choice(["Drill", "Saw", "Bolt"])
+            index.update(record)
+        elif action == "remove" and index.records:
+            index.remove([rng.choice(index.records)["id"]])
+        elif index.records:
+            index.remove(rng.sample([record["id"] for record in index.records], min(3, len(index.records))))
+    for mode in (RecordIndex.DATE_ADDED, "Name"):
+        for descending in (False, True):
+            assert page_ids(index, mode, 0, len(index), descending)[0] == expected_ids(index, mode, descending)
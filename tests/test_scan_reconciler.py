@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+import linkit
+from linkit import ScanReconciler
+
+
+def fake_decoder(path):
+    # Workers are spawned, so this must live at module level to be picklable
+    name = os.path.basename(path)
+    if name.startswith("crash"):
+        os._exit(1)
+    if name.startswith("raise"):
+        raise ValueError(f"Cannot decode {name}")
+    return path, [name], None
+
+
+def test_crashed_worker_only_fails_its_image():
+    paths = [f"scan{n}.png" for n in range(20)]
+    paths.insert(7, "crash.png")
+    reconciler = ScanReconciler(lambda item_id: None, max_workers=2, decoder=fake_decoder)
+
+    results = list(reconciler.decode_images(paths))
+
+    assert [path for path, _, _ in results] == paths
+    assert results[7] == ("crash.png", [], "Decoder crashed on this image")
+    assert all(payloads == [path] and error is None for path, payloads, error in results if path != "crash.png")
+
+
+def test_decoder_exception_only_fails_its_image():
+    paths = ["scan1.png", "raise.png", "scan2.png", "crash.png", "scan3.png"]
+    reconciler = ScanReconciler(lambda item_id: None, max_workers=2, decoder=fake_decoder)
+
+    results = list(reconciler.decode_images(paths))
+
+    assert [path for path, _, _ in results] == paths
+    assert results[1] == ("raise.png", [], "Cannot decode raise.png")
+    assert results[3] == ("crash.png", [], "Decoder crashed on this image")
+    assert [payloads for _, payloads, _ in results[::2]] == [["scan1.png"], ["scan2.png"], ["scan3.png"]]
+
+
+def test_custom_decoder_does_not_need_opencv(monkeypatch):
+    monkeypatch.setattr(linkit, "cv2", None)
+    items = {"scan1.png": {"id": "scan1.png"}}
+    reconciler = ScanReconciler(items.get, max_workers=1, decoder=fake_decoder)
+    report = reconciler.reconcile(["scan1.png", "scan2.png"], {"scan1.png"})
+    assert report["found"] == {"scan1.png"}
+    assert list(report["unknown"]) == ["scan2.png"]
+
+    with pytest.raises(RuntimeError):
+        ScanReconciler(items.get).reconcile([], set())
+
+
+def test_reconcile_qr_images(tmp_path):
+    pytest.importorskip("cv2")
+    qrcode = pytest.importorskip("qrcode")
+    items = {"item-1": {"id": "item-1"}, "item-2": {"id": "item-2"}, "item-3": {"id": "item-3"}}
+    qrcode.make("item-1").save(tmp_path / "bare.png")
+    qrcode.make("http://192.168.1.5:8765/items/item-2").save(tmp_path / "url.png")
+    qrcode.make("not-an-item").save(tmp_path / "unknown.png")
+    (tmp_path / "broken.jpg").write_bytes(b"junk")
+    reconciler = ScanReconciler(items.get, max_workers=2)
+
+    report = reconciler.reconcile(ScanReconciler.find_images(tmp_path), set(items))
+
+    assert report["images"] == 4
+    assert report["found"] == {"item-1", "item-2"}
+    assert report["missing"] == {"item-3"}
+    assert list(report["unknown"]) == ["not-an-item"]
+    assert [os.path.basename(path) for path, _ in report["errors"]] == ["broken.jpg"]
@@ -0,0 +1,56 @@
+from linkit import RecordIndex, TagIndex
+
+
+def make_index():
+    records = [
+        {"id": "1", "name": "Drill", "tags": ["location:a1", "owner:sam"]},
+        {"id": "2", "name": "Saw", "tags": ["location:a2", "owner:sam", "fragile"]},
+        {"id": "3", "name": "Tape", "tags": ["location:a2", "owner:kim"]},
+        {"id": "4", "name": "Glue", "tags": ["location:b1", "owner:sam"]},
+    ]
+    return RecordIndex(records, {"Name": lambda record: record["name"].lower()})
+
+
+def test_parse_tags_normalizes():
+    assert TagIndex.parse_tags(" Location : A1, bin:3,, location:a1 ,Fragile") == ["location:a1", "bin:3", "fragile"]
+
+
+def test_or_within_facet_and_across_facets():
+    tags = make_index().tag_index
+    assert tags.match(["location:a1", "location:a2", "owner:sam"]) == {"1", "2"}
+    assert tags.match(["location:a2"]) == {"2", "3"}
+    assert tags.match(["location:a2", "fragile"]) == {"2"}
+    assert tags.match(["location:a1", "location:a2", "owner:sam"], by_facet=False) == {"1", "2", "3", "4"}
+
+
+def test_facet_counts_grouped_by_facet():
+    index = make_index()
+    counts = index.tag_index.facet_counts({"1", "2", "3"})
+    assert TagIndex.group_by_facet(counts) == {
+        "location": {"a1": 1, "a2": 2},
+        "owner": {"sam": 2, "kim": 1},
+        "other": {"fragile": 1},
+    }
+    assert TagIndex.format_facets(counts).splitlines() == [
+        "location: a2 (2), a1 (1)",
+        "other: fragile (1)",
+        "owner: sam (2), kim (1)",
+    ]
+
+
+def test_index_tracks_tag_edits():
+    index = make_index()
+    record = index.get("3")
+    record["tags"] = ["location:b1", "owner:sam"]
+    index.update(record)
+    assert index.tag_index.match(["location:b1"]) == {"3", "4"}
+    index.remove(["4"])
+    assert index.tag_index.match(["location:b1"]) == {"3"}
+
+
+def test_tag_filter_composes_with_paging():
+    index = make_index()
+    ids = index.tag_index.match(["owner:sam"])
+    page, total = index.page("Name", 0, 2, ids=ids)
+    assert total == 3
+    assert [record["name"] for record in page] == ["Drill", "Glue"]